@@ -1,41 +1,73 @@
 """
 Market Aggregator - Matches and compares markets across platforms
 """
-from typing import List, Dict, Optional, Tuple
-from fuzzywuzzy import fuzz
+from typing import List, Dict, FrozenSet, Optional, Set, Tuple
+from collections import Counter, defaultdict
+import asyncio
+import heapq
+import itertools
+import math
+from rapidfuzz import fuzz, process, utils as fuzz_utils
+import numpy as np
 from datetime import datetime, timedelta
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from models import (
     UnifiedMarket, MarketComparison, Platform, MarketType,
-    normalize_market_title, extract_team_names, calculate_arbitrage
+    normalize_market_title
 )
 from api_clients.polymarket_client import PolymarketClient
 from api_clients.kalshi_client import KalshiClient
-from nfl_teams import extract_nfl_teams, are_same_nfl_teams
-from market_mappings import get_all_mappings_for_category, find_matching_market_ids
+from nfl_teams import extract_nfl_teams
+from market_mappings import FLAT_MAPPINGS
 
 class MarketAggregator:
     """Aggregates and matches markets from multiple platforms"""
     
     # Similarity threshold for fuzzy matching (0-100)
     TITLE_SIMILARITY_THRESHOLD = 80
+    PARTIAL_SIMILARITY_THRESHOLD = 90
+    TOKEN_SIMILARITY_THRESHOLD = 85
     TEAM_SIMILARITY_THRESHOLD = 85
     
     # Time window for matching markets (events should be within this window)
     TIME_WINDOW_HOURS = 24
     
-    def __init__(self):
-        self.polymarket_client = PolymarketClient()
-        self.kalshi_client = KalshiClient()
+    # Token blocking for sports pairs: words too common to narrow down candidates
+    BLOCKING_STOPWORDS = frozenset({
+        "the", "a", "an", "of", "in", "on", "at", "to", "by", "for", "and", "or",
+        "vs", "v", "win", "winner", "game", "match", "will", "who", "be"
+    })
+    # Tokens shared by more than this fraction of a bucket are ignored for blocking
+    BLOCKING_MAX_TOKEN_SHARE = 0.3
+    
+    def __init__(
+        self,
+        polymarket_client: Optional[PolymarketClient] = None,
+        kalshi_client: Optional[KalshiClient] = None
+    ):
+        # Pass long-lived clients in to reuse their keep-alive connections; the
+        # caller then owns them and only clients created here are closed after a fetch
+        self.polymarket_client = polymarket_client or PolymarketClient()
+        self.kalshi_client = kalshi_client or KalshiClient()
+        self._owned_clients = [
+            client for client, injected in (
+                (self.polymarket_client, polymarket_client),
+                (self.kalshi_client, kalshi_client),
+            ) if injected is None
+        ]
         
         # Cache for market data
         self.all_markets: List[UnifiedMarket] = []
         self.market_groups: List[List[UnifiedMarket]] = []
         self.comparisons: List[MarketComparison] = []
         
+        # (platform, market_id) -> market, rebuilt only when all_markets changes
+        self._market_lookup: Optional[Dict[Tuple[str, str], UnifiedMarket]] = None
+        self._market_lookup_source: Optional[List[UnifiedMarket]] = None
+        
+        # question -> NFL teams, filled in during each match_markets run
+        self._nfl_teams_cache: Dict[str, FrozenSet[str]] = {}
+        
     def fetch_all_markets(
         self,
         include_polymarket: bool = True,
@@ -43,92 +75,111 @@ class MarketAggregator:
         limit_per_platform: int = 100
     ) -> List[UnifiedMarket]:
         """Fetch markets from all enabled platforms (Polymarket and Kalshi)"""
-        all_markets = []
-        
+        return asyncio.run(self.fetch_all_markets_async(
+            include_polymarket=include_polymarket,
+            include_kalshi=include_kalshi,
+            limit_per_platform=limit_per_platform
+        ))
+    
+    async def fetch_all_markets_async(
+        self,
+        include_polymarket: bool = True,
+        include_kalshi: bool = True,
+        limit_per_platform: int = 100
+    ) -> List[UnifiedMarket]:
+        """
+        Fetch markets from all enabled platforms concurrently.
+        Requests overlap on the event loop so total latency is roughly that
+        of the slowest platform rather than the sum.
+        """
         print("=" * 60)
         print("FETCHING MARKETS FROM ALL PLATFORMS")
         print("=" * 60)
         
-        # Fetch from Polymarket
+        tasks = []
         if include_polymarket:
-            print("\n[1/3] Fetching from Polymarket...")
-            try:
-                polymarket_markets = self.polymarket_client.fetch_markets(
-                    limit=limit_per_platform,
-                    active=True,
-                    closed=False
-                )
-                all_markets.extend(polymarket_markets)
-                print(f"✓ Polymarket: {len(polymarket_markets)} markets")
-            except Exception as e:
-                print(f"✗ Error fetching Polymarket markets: {e}")
-        
-        # Fetch from Kalshi
+            tasks.append(self._fetch_polymarket_markets(limit_per_platform))
         if include_kalshi:
-            print("\n[2/3] Fetching from Kalshi...")
-            try:
-                kalshi_markets = self.kalshi_client.fetch_markets(
-                    status="open",
-                    limit=limit_per_platform
-                )
-                all_markets.extend(kalshi_markets)
-                print(f"✓ Kalshi: {len(kalshi_markets)} markets")
-            except Exception as e:
-                print(f"✗ Error fetching Kalshi markets: {e}")
+            tasks.append(self._fetch_kalshi_markets(limit_per_platform))
+        
+        try:
+            # Keep platform order stable (Polymarket first) since grouping is greedy
+            all_markets = list(itertools.chain.from_iterable(await asyncio.gather(*tasks)))
+        finally:
+            await asyncio.gather(*(client.aclose() for client in self._owned_clients))
         
         print("\n" + "=" * 60)
         print(f"TOTAL MARKETS FETCHED: {len(all_markets)}")
         print("=" * 60)
         
         self.all_markets = all_markets
+        self._market_lookup = None
         return all_markets
     
+    async def _fetch_polymarket_markets(self, limit: int) -> List[UnifiedMarket]:
+        """Fetch open Polymarket markets, returning an empty list on failure"""
+        print("\n[1/2] Fetching from Polymarket...")
+        try:
+            polymarket_markets = await self.polymarket_client.fetch_markets_async(
+                limit=limit,
+                active=True,
+                closed=False
+            )
+            print(f"✓ Polymarket: {len(polymarket_markets)} markets")
+            return polymarket_markets
+        except Exception as e:
+            print(f"✗ Error fetching Polymarket markets: {e}")
+            return []
+    
+    async def _fetch_kalshi_markets(self, limit: int) -> List[UnifiedMarket]:
+        """Fetch open Kalshi markets, returning an empty list on failure"""
+        print("\n[2/2] Fetching from Kalshi...")
+        try:
+            kalshi_markets = await self.kalshi_client.fetch_markets_async(
+                status="open",
+                limit=limit
+            )
+            print(f"✓ Kalshi: {len(kalshi_markets)} markets")
+            return kalshi_markets
+        except Exception as e:
+            print(f"✗ Error fetching Kalshi markets: {e}")
+            return []
+    
+    def _get_market_lookup(self) -> Dict[Tuple[str, str], UnifiedMarket]:
+        """Return a (platform, market_id) -> market index of all_markets"""
+        # all_markets may also be assigned directly, so check it is the same list
+        if self._market_lookup is None or self._market_lookup_source is not self.all_markets:
+            self._market_lookup = {
+                (market.platform.value, market.market_id): market
+                for market in self.all_markets
+            }
+            self._market_lookup_source = self.all_markets
+        return self._market_lookup
+    
     def _match_using_manual_mappings(self) -> List[List[UnifiedMarket]]:
         """
         Match markets using manual mappings from market_mappings.py
         Returns list of matched market groups
         """
-        from market_mappings import MANUAL_MAPPINGS
+        markets_by_platform_id = self._get_market_lookup()
         
         matched_groups = []
         
-        # Create lookup dictionaries for quick access
-        markets_by_platform_id = {}
-        for market in self.all_markets:
-            platform_key = f"{market.platform.value}_id"
-            markets_by_platform_id[(platform_key, market.market_id)] = market
-        
-        # Process each category
-        for category, mappings in MANUAL_MAPPINGS.items():
-            if not mappings:
-                continue
-            
-            print(f"\nChecking manual mappings for {category}...")
+        for category, poly_id, kalshi_id, description in FLAT_MAPPINGS:
+            group = [
+                market for market in (
+                    markets_by_platform_id.get((Platform.POLYMARKET.value, poly_id)),
+                    markets_by_platform_id.get((Platform.KALSHI.value, kalshi_id))
+                )
+                if market
+            ]
             
-            for mapping in mappings:
-                group = []
-                
-                # Try to find Polymarket market
-                poly_id = mapping.get("polymarket_id")
-                if poly_id:
-                    poly_market = markets_by_platform_id.get(("polymarket_id", poly_id))
-                    if poly_market:
-                        group.append(poly_market)
-                
-                # Try to find Kalshi market
-                kalshi_id = mapping.get("kalshi_id")
-                if kalshi_id:
-                    kalshi_market = markets_by_platform_id.get(("kalshi_id", kalshi_id))
-                    if kalshi_market:
-                        group.append(kalshi_market)
-                
-                
-                # Only add if we found at least 2 markets from different platforms
-                if len(group) >= 2:
-                    platforms = [m.platform.value for m in group]
-                    description = mapping.get("description", group[0].question[:50])
-                    print(f"  ✓ Matched (manual): {description}... across {platforms}")
-                    matched_groups.append(group)
+            # Only add if we found at least 2 markets from different platforms
+            if len(group) >= 2:
+                platforms = [m.platform.value for m in group]
+                description = description or group[0].question[:50]
+                print(f"  ✓ Matched (manual, {category}): {description}... across {platforms}")
+                matched_groups.append(group)
         
         return matched_groups
     
@@ -145,6 +196,9 @@ class MarketAggregator:
             print("No markets to match!")
             return []
         
+        # Team extraction is cached per run only, so it can't grow across tracker cycles
+        self._nfl_teams_cache.clear()
+        
         # Group markets by type first for efficiency
         markets_by_type: Dict[MarketType, List[UnifiedMarket]] = {}
         for market in self.all_markets:
@@ -168,6 +222,22 @@ class MarketAggregator:
         for market_type, markets in markets_by_type.items():
             print(f"\nMatching {market_type.value} markets ({len(markets)} total)...")
             
+            # Score every title pair in this bucket in one batched call
+            title_scores, partial_scores, token_scores = self._title_score_matrices(markets)
+            
+            # Pairs that pass one of the title checks
+            candidate_mask = (
+                (title_scores >= self.TITLE_SIMILARITY_THRESHOLD)
+                | (partial_scores >= self.PARTIAL_SIMILARITY_THRESHOLD)
+                | (token_scores >= self.TOKEN_SIMILARITY_THRESHOLD)
+            )
+            
+            # Sports pairs can also match on teams alone, so additionally consider
+            # any pair sharing a rare title token or team name
+            blocked_candidates = None
+            if market_type == MarketType.SPORTS:
+                blocked_candidates = self._blocked_candidates(markets)
+            
             for i, market1 in enumerate(markets):
                 # Skip if already matched
                 if market1.market_id in processed_market_ids:
@@ -177,8 +247,13 @@ class MarketAggregator:
                 current_group = [market1]
                 processed_market_ids.add(market1.market_id)
                 
-                # Try to find matching markets
-                for market2 in markets[i+1:]:
+                candidates = set((np.flatnonzero(candidate_mask[i, i + 1:]) + i + 1).tolist())
+                if blocked_candidates is not None:
+                    candidates.update(j for j in blocked_candidates[i] if j > i)
+                
+                # Try to find matching markets (in bucket order, as groups are built greedily)
+                for j in sorted(candidates):
+                    market2 = markets[j]
                     if market2.market_id in processed_market_ids:
                         continue
                     
@@ -187,7 +262,8 @@ class MarketAggregator:
                         continue
                     
                     # Check if markets match
-                    if self._are_markets_similar(market1, market2):
+                    scores = (title_scores[i, j], partial_scores[i, j], token_scores[i, j])
+                    if self._are_markets_similar(market1, market2, scores=scores):
                         current_group.append(market2)
                         processed_market_ids.add(market2.market_id)
                 
@@ -204,51 +280,163 @@ class MarketAggregator:
         self.market_groups = matched_groups
         return matched_groups
     
-    def _are_markets_similar(self, market1: UnifiedMarket, market2: UnifiedMarket) -> bool:
+    def _title_score_matrices(self, markets: List[UnifiedMarket]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Compute ratio, partial_ratio and token_sort_ratio for every pair of titles.
+        Scores below each threshold are reported as 0.
+        """
+        titles = [m.normalized_title for m in markets]
+        processed_titles = [m.processed_title for m in markets]
+        
+        title_scores = process.cdist(
+            titles, titles,
+            scorer=fuzz.ratio,
+            score_cutoff=self.TITLE_SIMILARITY_THRESHOLD,
+            dtype=np.uint8,
+            workers=-1
+        )
+        partial_scores = process.cdist(
+            titles, titles,
+            scorer=fuzz.partial_ratio,
+            score_cutoff=self.PARTIAL_SIMILARITY_THRESHOLD,
+            dtype=np.uint8,
+            workers=-1
+        )
+        token_scores = process.cdist(
+            processed_titles, processed_titles,
+            scorer=fuzz.token_sort_ratio,
+            score_cutoff=self.TOKEN_SIMILARITY_THRESHOLD,
+            dtype=np.uint8,
+            workers=-1
+        )
+        return title_scores, partial_scores, token_scores
+    
+    def _blocking_keys(self, market: UnifiedMarket) -> Set[str]:
+        """Tokens used to block candidate pairs: title words plus team names"""
+        keys = set(market.title_tokens)
+        for team in market.normalized_teams:
+            keys.update(fuzz_utils.default_process(team).split())
+        return keys - self.BLOCKING_STOPWORDS
+    
+    def _blocked_candidates(self, markets: List[UnifiedMarket]) -> List[Set[int]]:
+        """
+        For each market, return the indices of markets sharing at least one rare
+        blocking key (see _blocking_keys) or an NFL team, using inverted indexes.
+        
+        NFL teams are never capped as too common: in a short slate each team is
+        in every market for its game (e.g. one Polymarket and two Kalshi markets),
+        which is already over the share cap, and those titles only match on teams.
+        """
+        keys_per_market = [self._blocking_keys(m) for m in markets]
+        teams_per_market = [self._nfl_teams(m) for m in markets]
+        
+        inv_idx: Dict[str, Set[int]] = defaultdict(set)
+        for idx, keys in enumerate(keys_per_market):
+            for key in keys:
+                inv_idx[key].add(idx)
+        team_idx: Dict[str, Set[int]] = defaultdict(set)
+        for idx, teams in enumerate(teams_per_market):
+            for team in teams:
+                team_idx[team].add(idx)
+        
+        max_postings = max(2, int(len(markets) * self.BLOCKING_MAX_TOKEN_SHARE))
+        
+        candidates = []
+        for keys, teams in zip(keys_per_market, teams_per_market):
+            related: Set[int] = set()
+            for key in keys:
+                postings = inv_idx[key]
+                if len(postings) <= max_postings:
+                    related |= postings
+            for team in teams:
+                related |= team_idx[team]
+            candidates.append(related)
+        return candidates
+    
+    def _nfl_teams(self, market: UnifiedMarket) -> FrozenSet[str]:
+        """NFL teams in the market's question, extracted once per question"""
+        teams = self._nfl_teams_cache.get(market.question)
+        if teams is None:
+            teams = frozenset(extract_nfl_teams(market.question))
+            self._nfl_teams_cache[market.question] = teams
+        return teams
+    
+    @staticmethod
+    def _ratio_upper_bound(a: str, b: str) -> float:
+        """Highest fuzz.ratio two strings of these lengths can reach"""
+        total = len(a) + len(b)
+        if not total:
+            return 100.0
+        return 200.0 * min(len(a), len(b)) / total
+    
+    def _are_markets_similar(
+        self,
+        market1: UnifiedMarket,
+        market2: UnifiedMarket,
+        scores: Optional[Tuple[float, float, float]] = None
+    ) -> bool:
         """
         Determine if two markets are similar enough to be considered the same
+        
+        Args:
+            scores: Precomputed (ratio, partial_ratio, token_sort_ratio) title scores,
+                    e.g. from _title_score_matrices. Computed on demand if omitted.
         """
         # Different market types rarely match
         if market1.market_type != market2.market_type:
             return False
         
-        # Check title similarity
-        title_score = fuzz.ratio(market1.normalized_title, market2.normalized_title)
+        if scores is not None:
+            title_score, partial_score, token_score = scores
+        else:
+            title_score = partial_score = token_score = None
+        
+        # Check title similarity (skipped when the lengths alone rule it out)
+        if title_score is None:
+            if self._ratio_upper_bound(market1.normalized_title, market2.normalized_title) < self.TITLE_SIMILARITY_THRESHOLD:
+                title_score = 0
+            else:
+                title_score = fuzz.ratio(
+                    market1.normalized_title,
+                    market2.normalized_title,
+                    score_cutoff=self.TITLE_SIMILARITY_THRESHOLD
+                )
         if title_score >= self.TITLE_SIMILARITY_THRESHOLD:
             return True
         
         # Check partial match (one title contained in another)
-        partial_score = fuzz.partial_ratio(market1.normalized_title, market2.normalized_title)
-        if partial_score >= 90:
+        if partial_score is None:
+            partial_score = fuzz.partial_ratio(market1.normalized_title, market2.normalized_title)
+        if partial_score >= self.PARTIAL_SIMILARITY_THRESHOLD:
             return True
         
         # For sports markets, check team names
         if market1.market_type == MarketType.SPORTS:
             # Try NFL-specific team matching first (handles Chiefs/Kansas City etc.)
             try:
-                nfl_teams1 = extract_nfl_teams(market1.question)
-                nfl_teams2 = extract_nfl_teams(market2.question)
+                nfl_teams1 = self._nfl_teams(market1)
+                nfl_teams2 = self._nfl_teams(market2)
                 
-                if nfl_teams1 and nfl_teams2 and len(nfl_teams1) >= 1 and len(nfl_teams2) >= 1:
-                    if are_same_nfl_teams(nfl_teams1, nfl_teams2):
-                        # Also check time proximity
-                        if self._check_time_proximity(market1, market2):
-                            print(f"    ✓ NFL team match: {nfl_teams1} == {nfl_teams2}")
-                            return True
+                # Extracted teams are already canonical mascots, so compare the sets directly
+                if nfl_teams1 and nfl_teams1 == nfl_teams2:
+                    # Also check time proximity
+                    if self._check_time_proximity(market1, market2):
+                        print(f"    ✓ NFL team match: {sorted(nfl_teams1)} == {sorted(nfl_teams2)}")
+                        return True
             except Exception as e:
                 # Fall back to generic team matching if NFL matching fails
                 pass
             
             # Generic team matching (for non-NFL or as fallback)
             if market1.normalized_teams and market2.normalized_teams:
-                # Check if teams match
-                team_matches = 0
-                for team1 in market1.normalized_teams:
-                    for team2 in market2.normalized_teams:
-                        team_score = fuzz.ratio(team1, team2)
-                        if team_score >= self.TEAM_SIMILARITY_THRESHOLD:
-                            team_matches += 1
-                            break
+                # Count teams in market1 that match some team in market2
+                team_scores = process.cdist(
+                    market1.normalized_teams,
+                    market2.normalized_teams,
+                    scorer=fuzz.ratio,
+                    score_cutoff=self.TEAM_SIMILARITY_THRESHOLD
+                )
+                team_matches = int((team_scores >= self.TEAM_SIMILARITY_THRESHOLD).any(axis=1).sum())
                 
                 # If at least 2 teams match, consider it the same market
                 if team_matches >= 2:
@@ -257,8 +445,13 @@ class MarketAggregator:
                         return True
         
         # Check token-based similarity (for more flexible matching)
-        token_score = fuzz.token_sort_ratio(market1.normalized_title, market2.normalized_title)
-        if token_score >= 85:
+        # Token sort compares preprocessed titles, matching fuzzywuzzy's full_process behaviour
+        if token_score is None:
+            token_score = fuzz.token_sort_ratio(
+                market1.processed_title,
+                market2.processed_title
+            )
+        if token_score >= self.TOKEN_SIMILARITY_THRESHOLD:
             # For high token similarity, also check time proximity
             if self._check_time_proximity(market1, market2):
                 return True
@@ -280,90 +473,22 @@ class MarketAggregator:
         print("CREATING PRICE COMPARISONS")
         print("=" * 60)
         
-        comparisons = []
-        
-        for group in self.market_groups:
-            if len(group) < 2:
-                continue
-            
-            try:
-                comparison = self._create_comparison(group)
-                if comparison:
-                    comparisons.append(comparison)
-            except Exception as e:
-                print(f"Error creating comparison: {e}")
-                continue
+        groups = [group for group in self.market_groups if len(group) >= 2]
+        comparisons = _create_comparisons_batch(groups)
         
         print(f"\nCreated {len(comparisons)} price comparisons")
         
         self.comparisons = comparisons
         return comparisons
     
-    def _create_comparison(self, markets: List[UnifiedMarket]) -> Optional[MarketComparison]:
+    @staticmethod
+    def _create_comparison(markets: List[UnifiedMarket]) -> Optional[MarketComparison]:
         """Create a comparison object for a group of similar markets"""
         if not markets:
             return None
         
-        # Use the first market's question as the canonical question
-        question = markets[0].question
-        normalized_title = markets[0].normalized_title
-        market_type = markets[0].market_type
-        
-        # Find the best odds across all markets
-        # We'll look at the "Yes" outcome or the first outcome
-        best_platform = None
-        best_outcome_name = ""
-        best_price = 0.0
-        best_odds = ""
-        worst_price = 1.0
-        
-        for market in markets:
-            if not market.outcomes:
-                continue
-            
-            # Get the first outcome (usually "Yes" or the favored outcome)
-            outcome = market.outcomes[0]
-            
-            # Higher price = better for the bettor
-            if outcome.price > best_price:
-                best_price = outcome.price
-                best_platform = market.platform
-                best_outcome_name = outcome.name
-                best_odds = outcome.american_odds
-            
-            if outcome.price < worst_price:
-                worst_price = outcome.price
-        
-        if not best_platform:
-            return None
-        
-        # Calculate price spread (in probability terms)
-        price_spread = round((best_price - worst_price) * 100, 2)  # Convert to percentage
-        
-        # Check for arbitrage opportunities
-        # Collect best prices for all outcomes across platforms
-        outcome_best_prices = []
-        for market in markets:
-            for outcome in market.outcomes:
-                outcome_best_prices.append(outcome.price)
-        
-        arbitrage, arb_percentage = calculate_arbitrage(outcome_best_prices)
-        
-        comparison = MarketComparison(
-            question=question,
-            markets=markets,
-            best_platform=best_platform,
-            best_outcome_name=best_outcome_name,
-            best_price=best_price,
-            best_odds=best_odds,
-            price_spread=price_spread,
-            arbitrage_opportunity=arbitrage,
-            arbitrage_percentage=arb_percentage,
-            market_type=market_type,
-            normalized_title=normalized_title
-        )
-        
-        return comparison
+        comparisons = _create_comparisons_batch([markets])
+        return comparisons[0] if comparisons else None
     
     def calculate_price_deltas(self, old_comparisons: List[MarketComparison]) -> List[MarketComparison]:
         """
@@ -372,7 +497,7 @@ class MarketAggregator:
         if not old_comparisons:
             return self.comparisons
         
-        # Create a map of old comparisons by normalized title
+        # Map of old comparisons by normalized title
         old_comp_map = {comp.normalized_title: comp for comp in old_comparisons}
         
         for comparison in self.comparisons:
@@ -380,14 +505,15 @@ class MarketAggregator:
             if not old_comp:
                 continue
             
+            # First old market per platform
+            old_by_platform = {}
+            for old_m in old_comp.markets:
+                old_by_platform.setdefault(old_m.platform, old_m)
+            
             # Calculate deltas for each platform
             for market in comparison.markets:
                 # Find the corresponding market in old comparison
-                old_market = None
-                for old_m in old_comp.markets:
-                    if old_m.platform == market.platform:
-                        old_market = old_m
-                        break
+                old_market = old_by_platform.get(market.platform)
                 
                 if not old_market or not market.outcomes or not old_market.outcomes:
                     continue
@@ -403,13 +529,8 @@ class MarketAggregator:
     
     def get_best_odds_markets(self, limit: int = 10) -> List[MarketComparison]:
         """Get markets with the best price differentials"""
-        # Sort by price spread (descending)
-        sorted_comps = sorted(
-            self.comparisons,
-            key=lambda c: c.price_spread,
-            reverse=True
-        )
-        return sorted_comps[:limit]
+        # Top `limit` by price spread (descending) without sorting everything
+        return heapq.nlargest(limit, self.comparisons, key=lambda c: c.price_spread)
     
     def get_arbitrage_opportunities(self) -> List[MarketComparison]:
         """Get markets with arbitrage opportunities"""
@@ -426,25 +547,22 @@ class MarketAggregator:
         print("=" * 60)
         
         # Count markets by platform
-        platform_counts = {}
-        for market in self.all_markets:
-            platform = market.platform.value
-            platform_counts[platform] = platform_counts.get(platform, 0) + 1
+        platform_counts = Counter(market.platform.value for market in self.all_markets)
         
         print("\nMarkets by Platform:")
         for platform, count in platform_counts.items():
             print(f"  {platform}: {count}")
         
         # Count by market type
-        type_counts = {}
-        for market in self.all_markets:
-            mtype = market.market_type.value
-            type_counts[mtype] = type_counts.get(mtype, 0) + 1
+        type_counts = Counter(market.market_type.value for market in self.all_markets)
         
         print("\nMarkets by Type:")
         for mtype, count in type_counts.items():
             print(f"  {mtype}: {count}")
         
+        title_cache = normalize_market_title.cache_info()
+        print(f"\nTitle normalization cache: {title_cache.hits} hits, {title_cache.misses} misses")
+        
         print(f"\nMatched Groups: {len(self.market_groups)}")
         print(f"Price Comparisons: {len(self.comparisons)}")
         print(f"Arbitrage Opportunities: {len(self.get_arbitrage_opportunities())}")
@@ -466,6 +584,103 @@ class MarketAggregator:
         print("\n" + "=" * 60)
 
 
+def _has_valid_prices(markets: List[UnifiedMarket]) -> bool:
+    """Whether every outcome price in the group is a finite number (bad groups are logged and skipped)"""
+    for market in markets:
+        for outcome in market.outcomes:
+            price = outcome.price
+            if not isinstance(price, (int, float)) or not math.isfinite(price):
+                print(f"Error creating comparison: invalid price {price!r} for {market.platform.value} market {market.market_id}")
+                return False
+    return True
+
+
+def _create_comparisons_batch(groups: List[List[UnifiedMarket]]) -> List[MarketComparison]:
+    """
+    Create comparisons for a batch of market groups, skipping failed groups.
+    
+    Per-group price stats are computed in one vectorized pass over flat arrays:
+    - best/worst price over each market's first outcome (usually "Yes" or the favored outcome)
+    - sum and count of all outcome prices, for the arbitrage check
+    """
+    groups = [group for group in groups if group and _has_valid_prices(group)]
+    if not groups:
+        return []
+    
+    # Flatten first-outcome prices (one per market with outcomes) and all outcome prices
+    first_prices = []
+    first_group_idx = []
+    first_markets = []
+    all_prices = []
+    all_group_idx = []
+    for group_idx, markets in enumerate(groups):
+        for market in markets:
+            if not market.outcomes:
+                continue
+            first_prices.append(market.outcomes[0].price)
+            first_group_idx.append(group_idx)
+            first_markets.append(market)
+            for outcome in market.outcomes:
+                all_prices.append(outcome.price)
+                all_group_idx.append(group_idx)
+    
+    n_groups = len(groups)
+    first_prices = np.asarray(first_prices, dtype=np.float64)
+    first_group_idx = np.asarray(first_group_idx, dtype=np.intp)
+    
+    # Higher price = better for the bettor; prices must beat 0.0 to count as best
+    best_price = np.zeros(n_groups)
+    np.maximum.at(best_price, first_group_idx, first_prices)
+    worst_price = np.ones(n_groups)
+    np.minimum.at(worst_price, first_group_idx, first_prices)
+    
+    # First market in each group that reaches the best price
+    is_best = first_prices == best_price[first_group_idx]
+    best_groups, best_pos = np.unique(first_group_idx[is_best], return_index=True)
+    best_market_idx = np.full(n_groups, -1, dtype=np.intp)
+    best_market_idx[best_groups] = np.flatnonzero(is_best)[best_pos]
+    best_market_idx[best_price <= 0.0] = -1
+    
+    # Arbitrage: implied probabilities of all outcomes summing below 1
+    all_group_idx = np.asarray(all_group_idx, dtype=np.intp)
+    prob_sums = np.bincount(all_group_idx, weights=all_prices, minlength=n_groups)
+    outcome_counts = np.bincount(all_group_idx, minlength=n_groups)
+    has_arbitrage = (outcome_counts >= 2) & (prob_sums < 1.0)
+    
+    comparisons = []
+    for group_idx, markets in enumerate(groups):
+        try:
+            if best_market_idx[group_idx] < 0:
+                continue
+            
+            best_market = first_markets[best_market_idx[group_idx]]
+            best_outcome = best_market.outcomes[0]
+            
+            # Price spread in probability terms, converted to percentage
+            price_spread = round((best_outcome.price - float(worst_price[group_idx])) * 100, 2)
+            
+            arbitrage = bool(has_arbitrage[group_idx])
+            arb_percentage = round((1.0 - float(prob_sums[group_idx])) * 100, 2) if arbitrage else None
+            
+            # Use the first market's question as the canonical question
+            comparisons.append(MarketComparison(
+                question=markets[0].question,
+                markets=markets,
+                best_platform=best_market.platform,
+                best_outcome_name=best_outcome.name,
+                best_price=best_outcome.price,
+                best_odds=best_outcome.american_odds,
+                price_spread=price_spread,
+                arbitrage_opportunity=arbitrage,
+                arbitrage_percentage=arb_percentage,
+                market_type=markets[0].market_type,
+                normalized_title=markets[0].normalized_title
+            ))
+        except Exception as e:
+            print(f"Error creating comparison: {e}")
+            continue
+    return comparisons
+
 if __name__ == "__main__":
     # Test the aggregator
     aggregator = MarketAggregator()
@@ -475,7 +690,6 @@ if __name__ == "__main__":
     markets = aggregator.fetch_all_markets(
         include_polymarket=True,
         include_kalshi=True,
-        include_limitless=True,
         limit_per_platform=50
     )
     
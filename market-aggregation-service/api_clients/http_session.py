@@ -0,0 +1,467 @@
+"""
+Shared HTTP session setup for the API clients
+"""
+import asyncio
+import codecs
+import json
+import threading
+import time
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple
+
+import aiohttp
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_HEADERS = {
+    "User-Agent": "market-aggregation-service/1.0",
+    "Accept": "application/json",
+}
+
+# Per-host keep-alive pool for the sync sessions. Sized above the default
+# threadpool that runs sync FastAPI work (40) so concurrent threads don't
+# overflow the pool and drop connections after use.
+POOL_CONNECTIONS = 20
+POOL_MAXSIZE = 50
+
+# Max in-flight async requests per client (each client talks to one host family)
+HOST_CONCURRENCY = 64
+AIO_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+# Market snapshots move on the order of seconds; this only collapses repeat polls
+RESPONSE_CACHE_TTL_SECONDS = 5
+RESPONSE_CACHE_MAXSIZE = 256
+
+# Retry policy shared by the sync (urllib3 Retry) and async request paths
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_AFTER_MAX_SECONDS = 60
+
+# Exceptions the async fetch paths treat like requests.exceptions.RequestException
+AIO_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError)
+# Connection-level failures the async path retries, as urllib3 Retry does for the sync session.
+# Timeouts aren't retried: AIO_TIMEOUT is a total, so a retry could quadruple a stall
+AIO_TRANSIENT_ERRORS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+
+
+class ResponseTooLargeError(aiohttp.ClientError):
+    """Response body exceeded the client's max response size (not retried)"""
+
+
+class FlightCancelledError(Exception):
+    """Set on a shared in-flight request whose leading caller was cancelled; waiters retry"""
+
+
+class RateLimiter:
+    """
+    Token bucket allowing `rate` requests per `period` seconds
+
+    Each acquire reserves a token up front (the balance may go negative), so
+    concurrent callers from threads or tasks are spaced out in arrival order.
+    """
+
+    def __init__(self, rate: float, period: float = 1.0):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.period)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens * self.period / self.rate)
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that waits on a RateLimiter before sending each request"""
+
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return super().send(request, **kwargs)
+
+
+def create_session(
+    headers: Optional[Dict[str, str]] = None,
+    rate_limiter: Optional[RateLimiter] = None
+) -> requests.Session:
+    """
+    Build a requests.Session with a pooled, retrying HTTPS adapter
+
+    Reusing one session per client keeps TCP/TLS connections alive between
+    calls to the same host instead of handshaking on every request. 429/5xx
+    responses are retried with exponential backoff, honouring Retry-After.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=list(RETRY_STATUSES),
+        allowed_methods=["GET"],
+    )
+    adapter = RateLimitedAdapter(
+        rate_limiter,
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=False,
+        max_retries=retry,
+    )
+    session.mount("https://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+class ResponseCache:
+    """
+    Small in-memory TTL cache for decoded API responses, keyed by (url, params)
+
+    Entries younger than ttl are served without a request. Older entries are
+    kept (until evicted, oldest first, at maxsize) along with the response's
+    ETag/Last-Modified so the next request can be made conditional and a 304
+    can reuse the stored payload.
+    """
+
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL_SECONDS, maxsize: int = RESPONSE_CACHE_MAXSIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # key -> (stored_at, value, conditional request headers)
+        self._entries: Dict[Hashable, Tuple[float, Any, Dict[str, str]]] = {}
+        # Fresh lookups served from memory / lookups that went to the network
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict[str, Any]] = None) -> Hashable:
+        # List values (repeated query params) become tuples so the key stays hashable
+        return (url, tuple(sorted(
+            (name, tuple(value) if isinstance(value, list) else value) for name, value in (params or {}).items()
+        )))
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or older than ttl"""
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def conditional_headers(self, key: Hashable) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for revalidating an entry"""
+        entry = self._entries.get(key)
+        return dict(entry[2]) if entry else {}
+
+    def revalidate(self, key: Hashable) -> Optional[Any]:
+        """Mark an entry fresh again after a 304 and return its value"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries[key] = (time.monotonic(), entry[1], entry[2])
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        validators = {}
+        if etag:
+            validators["If-None-Match"] = etag
+        if last_modified:
+            validators["If-Modified-Since"] = last_modified
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            self._entries.pop(next(iter(self._entries)), None)
+        self._entries[key] = (time.monotonic(), value, validators)
+
+    def clear(self):
+        self._entries.clear()
+
+
+def get_json_cached(
+    session: requests.Session,
+    cache: ResponseCache,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: float = 30
+) -> Any:
+    """
+    GET url through cache: serve fresh entries directly, otherwise make a
+    conditional request and reuse the stored payload on 304
+
+    Raises requests.exceptions.RequestException on HTTP/decode errors.
+    """
+    key = cache.key(url, params)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    cache.misses += 1
+    response = session.get(url, params=params, headers=cache.conditional_headers(key), timeout=timeout)
+    if response.status_code == 304:
+        cached = cache.revalidate(key)
+        if cached is not None:
+            return cached
+        # Entry was evicted in the meantime; fetch the full body
+        response = session.get(url, params=params, timeout=timeout)
+    response.raise_for_status()
+
+    data = decode_json(response)
+    cache.set(key, data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return data
+
+
+def decode_json(response: requests.Response) -> Any:
+    """
+    Decode a response body with orjson
+
+    Decode errors are re-raised as requests' JSONDecodeError so existing
+    `except requests.exceptions.RequestException` handlers still catch them.
+    """
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos)
+
+
+def iter_json_array(response: requests.Response, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array from a streamed response
+
+    Elements are decoded as soon as their closing bracket arrives, so only one
+    element (plus the current network chunk) is held in memory at a time.
+    Intended for arrays of objects/arrays; a bare number split across chunks
+    could be yielded truncated.
+
+    Raises requests.exceptions.JSONDecodeError if the body is not an array.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    started = False
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        buffer += text.decode(chunk)
+        pos = 0
+        while True:
+            pos = _skip_separators(buffer, pos)
+            if pos >= len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise requests.exceptions.JSONDecodeError("Expected a JSON array", buffer, pos)
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element is incomplete; wait for the next chunk
+                break
+            yield item
+        buffer = buffer[pos:]
+    raise requests.exceptions.JSONDecodeError("Unterminated JSON array", buffer, len(buffer))
+
+
+def _skip_separators(buffer: str, pos: int) -> int:
+    while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+        pos += 1
+    return pos
+
+
+def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+    """Seconds to wait before retry `attempt`: Retry-After if given, else exponential backoff"""
+    if retry_after:
+        try:
+            return min(float(retry_after), RETRY_AFTER_MAX_SECONDS)
+        except ValueError:
+            pass
+    return RETRY_BACKOFF_FACTOR * (2 ** attempt)
+
+
+def create_aio_session(headers: Optional[Dict[str, str]] = None) -> aiohttp.ClientSession:
+    """
+    Build an aiohttp.ClientSession for the async fetch paths
+
+    Must be called from inside a running event loop; the session is bound to it.
+    """
+    connector = aiohttp.TCPConnector(
+        limit_per_host=HOST_CONCURRENCY,
+        ttl_dns_cache=300,
+        keepalive_timeout=75,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={**DEFAULT_HEADERS, **(headers or {})},
+        timeout=AIO_TIMEOUT,
+    )
+
+
+class AsyncSessionMixin:
+    """
+    Lazily created aiohttp session for a client's async fetch paths
+
+    The session and its concurrency semaphore are bound to the event loop that
+    created them, so they are rebuilt if the client is reused under a new loop
+    (e.g. across separate asyncio.run calls).
+    """
+    _aio_session: Optional[aiohttp.ClientSession] = None
+    _aio_semaphore: Optional[asyncio.Semaphore] = None
+    _aio_loop: Optional[asyncio.AbstractEventLoop] = None
+    _aio_headers: Optional[Dict[str, str]] = None
+    # (url, params) -> future for the request currently fetching it
+    _aio_inflight: Optional[Dict[Hashable, asyncio.Future]] = None
+    # Shared with the client's sync session when set
+    _rate_limiter: Optional[RateLimiter] = None
+    # Bodies larger than this are rejected with ResponseTooLargeError before decoding
+    _max_response_bytes: Optional[int] = None
+
+    def _get_aio_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._aio_session is None or self._aio_session.closed or self._aio_loop is not loop:
+            self._aio_session = create_aio_session(self._aio_headers)
+            self._aio_semaphore = asyncio.Semaphore(HOST_CONCURRENCY)
+            self._aio_inflight = {}
+            self._aio_loop = loop
+        return self._aio_session
+
+    async def _get_json_async(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        cache: Optional[ResponseCache] = None
+    ) -> Any:
+        """
+        GET url and decode the JSON body, raising on HTTP errors
+
+        Applies the client's rate limiter and retries 429/5xx responses and
+        connection errors like the sync session does. With a cache, behaves like get_json_cached
+        (fresh hits, conditional requests, 304 reuse). Concurrent calls for
+        the same url and params share a single request and its result; if its
+        caller is cancelled, the others retry rather than being cancelled too.
+        """
+        self._get_aio_session()
+        flight_key = ResponseCache.key(url, params)
+        while (pending := self._aio_inflight.get(flight_key)) is not None:
+            try:
+                return await asyncio.shield(pending)
+            except FlightCancelledError:
+                # The caller we joined was cancelled, not us: rejoin or lead the retry
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._aio_inflight[flight_key] = future
+        try:
+            data = await self._fetch_json_async(url, params, headers, cache)
+        except asyncio.CancelledError:
+            # Cancelling the future would cancel waiters too; let them retry instead
+            future.set_exception(FlightCancelledError())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure isn't logged by asyncio
+            future.exception()
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            if self._aio_inflight.get(flight_key) is future:
+                del self._aio_inflight[flight_key]
+
+    async def _fetch_json_async(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        cache: Optional[ResponseCache]
+    ) -> Any:
+        """Uncoalesced request behind _get_json_async"""
+        key = None
+        if cache is not None:
+            key = cache.key(url, params)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            cache.misses += 1
+            headers = {**(headers or {}), **cache.conditional_headers(key)}
+
+        session = self._get_aio_session()
+        if params:
+            # aiohttp rejects bool query values and doesn't expand lists; encode them the way requests does
+            params = [
+                (name, str(item))
+                for name, value in params.items()
+                for item in (value if isinstance(value, (list, tuple)) else (value,))
+            ]
+        for attempt in range(RETRY_TOTAL + 1):
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire_async()
+            try:
+                async with self._aio_semaphore:
+                    async with session.get(url, params=params, headers=headers) as response:
+                        if response.status in RETRY_STATUSES and attempt < RETRY_TOTAL:
+                            delay = _retry_delay(response.headers.get("Retry-After"), attempt)
+                        else:
+                            if response.status == 304 and cache is not None:
+                                cached = cache.revalidate(key)
+                                if cached is not None:
+                                    return cached
+                            response.raise_for_status()
+                            data = orjson.loads(await self._read_body(response))
+                            break
+            except asyncio.TimeoutError:
+                # Newer aiohttp timeout errors also subclass ClientConnectionError
+                raise
+            except AIO_TRANSIENT_ERRORS:
+                if attempt == RETRY_TOTAL:
+                    raise
+                delay = _retry_delay(None, attempt)
+            await asyncio.sleep(delay)
+
+        if cache is not None:
+            cache.set(key, data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return data
+
+    async def _read_body(self, response: aiohttp.ClientResponse) -> bytes:
+        """Read the response body, enforcing _max_response_bytes while streaming"""
+        limit = self._max_response_bytes
+        if limit is None:
+            return await response.read()
+        if response.content_length is not None and response.content_length > limit:
+            raise ResponseTooLargeError(f"{response.url}: {response.content_length} bytes exceeds {limit}")
+        body = bytearray()
+        async for chunk in response.content.iter_any():
+            body += chunk
+            if len(body) > limit:
+                raise ResponseTooLargeError(f"{response.url}: body exceeds {limit} bytes")
+        return bytes(body)
+
+    async def aclose(self):
+        """Close the aiohttp session if one is open"""
+        if self._aio_session is not None and not self._aio_session.closed:
+            await self._aio_session.close()
+        self._aio_session = None
+        self._aio_semaphore = None
+        self._aio_inflight = None
+        self._aio_loop = None
@@ -1,26 +1,90 @@
 """
 Kalshi API Client
 """
+import asyncio
 import requests
 import jwt
+import json
+import random
+import re
 import time
 import os
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+import numpy as np
 from datetime import datetime
-from dateutil import parser as date_parser
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.backends import default_backend
-import sys
 
-# Add parent directory to path to import models
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import (
     UnifiedMarket, MarketOutcome, Platform, MarketType,
-    calculate_decimal_odds, calculate_american_odds,
-    normalize_market_title, extract_team_names
+    calculate_decimal_odds, calculate_american_odds, parse_iso_datetime
 )
+from api_clients.http_session import AIO_ERRORS, AsyncSessionMixin, RateLimiter, ResponseCache, create_session, decode_json, get_json_cached
 
-class KalshiClient:
+# Signed tokens are shared across processes/CLI runs through this file
+TOKEN_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "kalshi", "token.json")
+TOKEN_REFRESH_JITTER = 60  # seconds
+
+# Stay under Kalshi's read rate limit so polling never trips 429s
+KALSHI_REQUESTS_PER_SECOND = 10
+
+# Market type keywords, matched as plain substrings
+_SPORTS_PATTERN = re.compile("|".join(map(re.escape, [
+    "nfl", "nba", "mlb", "nhl", "game", "match", "football", "basketball", "soccer"
+])))
+_POLITICS_PATTERN = re.compile("|".join(map(re.escape, [
+    "election", "president", "senate", "congress", "politics"
+])))
+_CRYPTO_PATTERN = re.compile("|".join(map(re.escape, [
+    "crypto", "bitcoin", "btc", "ethereum", "eth"
+])))
+
+def _binary_prices(raw_markets: List[Dict[str, Any]]) -> Optional[List[Tuple[float, float]]]:
+    """
+    Compute (yes_price, no_price) for a batch of raw markets in one vectorized pass
+    
+    Mirrors the scalar logic in KalshiClient._convert_to_unified: ask prices in
+    cents, falling back to last_price (yes) / 1 - yes (no), then clamped to 0.5
+    when outside (0, 1). Returns None if any price field is malformed so callers
+    fall back to the per-market path (and its error reporting).
+    """
+    n = len(raw_markets)
+    if not n:
+        return []
+    try:
+        yes_asks = np.fromiter((m.get("yes_ask", 0) for m in raw_markets), dtype=np.float64, count=n)
+        no_asks = np.fromiter((m.get("no_ask", 0) for m in raw_markets), dtype=np.float64, count=n)
+        last_prices = np.fromiter((m.get("last_price", 50) for m in raw_markets), dtype=np.float64, count=n)
+    except (TypeError, ValueError):
+        return None
+    
+    yes = yes_asks / 100.0
+    yes = np.where(yes == 0, last_prices / 100.0, yes)
+    no = no_asks / 100.0
+    no = np.where(no == 0, 1.0 - yes, no)
+    
+    yes = np.where((yes <= 0) | (yes >= 1), 0.5, yes)
+    no = np.where((no <= 0) | (no >= 1), 0.5, no)
+    return list(zip(yes.tolist(), no.tolist()))
+
+_COMMA_STRIP = str.maketrans("", "", ",$")
+
+def _parse_liquidity(raw_market: Dict[str, Any]) -> Any:
+    """
+    Market liquidity in dollars: liquidity_dollars (a formatted string such as
+    "1,234.50") when present, otherwise the raw liquidity field
+    """
+    dollars = raw_market.get("liquidity_dollars")
+    if not dollars:
+        return raw_market.get("liquidity", 0)
+    if isinstance(dollars, (int, float)):
+        return float(dollars)
+    try:
+        return float(dollars.translate(_COMMA_STRIP))
+    except (AttributeError, ValueError):
+        return raw_market.get("liquidity", 0)
+
+class KalshiClient(AsyncSessionMixin):
     """Client for interacting with Kalshi API"""
     
     def __init__(self, api_key: Optional[str] = None, private_key_path: Optional[str] = None):
@@ -29,30 +93,74 @@ class KalshiClient:
         self.private_key_path = private_key_path or os.getenv("KALSHI_PRIVATE_KEY_PATH")
         self.token = None
         self.token_expiry = 0
+        self._private_key_obj = None
+        self._private_key_mtime = None
+        self._rate_limiter = RateLimiter(KALSHI_REQUESTS_PER_SECOND)
+        self._session = create_session(rate_limiter=self._rate_limiter)
+        self._session_token = None
+        self._response_cache = ResponseCache()
         
-    def _load_private_key(self) -> Optional[str]:
-        """Load RSA private key from file"""
-        if not self.private_key_path or not os.path.exists(self.private_key_path):
+    def close(self):
+        """Close the underlying HTTP session"""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _load_private_key(self):
+        """Load RSA private key from file, re-parsing the PEM only when the file changes"""
+        if not self.private_key_path:
             return None
+        
+        try:
+            mtime = os.stat(self.private_key_path).st_mtime
+        except OSError:
+            return None
+        
+        if self._private_key_obj is not None and mtime == self._private_key_mtime:
+            return self._private_key_obj
             
         try:
             with open(self.private_key_path, 'rb') as key_file:
-                private_key = serialization.load_pem_private_key(
+                self._private_key_obj = serialization.load_pem_private_key(
                     key_file.read(),
                     password=None,
                     backend=default_backend()
                 )
-                # Convert to PEM string
-                pem = private_key.private_bytes(
-                    encoding=serialization.Encoding.PEM,
-                    format=serialization.PrivateFormat.PKCS8,
-                    encryption_algorithm=serialization.NoEncryption()
-                )
-                return pem.decode('utf-8')
+                self._private_key_mtime = mtime
+                return self._private_key_obj
         except Exception as e:
             print(f"Error loading private key: {e}")
             return None
     
+    def _load_cached_token(self) -> Optional[str]:
+        """Return a still-valid token minted by an earlier process, if any"""
+        try:
+            with open(TOKEN_CACHE_PATH) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if cached.get("sub") != self.api_key or time.time() >= cached.get("exp", 0):
+            return None
+        
+        self.token = cached["token"]
+        self.token_expiry = cached["exp"]
+        return self.token
+    
+    def _save_cached_token(self):
+        """Persist the current token so other processes can reuse it"""
+        try:
+            os.makedirs(os.path.dirname(TOKEN_CACHE_PATH), exist_ok=True)
+            fd = os.open(TOKEN_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"sub": self.api_key, "token": self.token, "exp": self.token_expiry}, f)
+        except OSError as e:
+            print(f"Warning: Could not cache Kalshi token: {e}")
+    
     def _get_auth_token(self) -> Optional[str]:
         """Get authentication token using API key and private key"""
         # Check if we have a valid cached token
@@ -63,6 +171,10 @@ class KalshiClient:
             print("Warning: No Kalshi API key configured")
             return None
         
+        cached_token = self._load_cached_token()
+        if cached_token:
+            return cached_token
+        
         private_key = self._load_private_key()
         if not private_key:
             print("Warning: No Kalshi private key configured")
@@ -79,7 +191,9 @@ class KalshiClient:
         try:
             token = jwt.encode(payload, private_key, algorithm='RS256')
             self.token = token
-            self.token_expiry = now + 3500  # Refresh 100 seconds before expiry
+            # Refresh ~100 seconds before expiry, jittered so workers don't all re-sign at once
+            self.token_expiry = now + 3500 + random.randint(-TOKEN_REFRESH_JITTER, TOKEN_REFRESH_JITTER)
+            self._save_cached_token()
             return token
         except Exception as e:
             print(f"Error creating JWT token: {e}")
@@ -88,18 +202,39 @@ class KalshiClient:
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
         """Make authenticated request to Kalshi API"""
         url = f"{self.api_base}{endpoint}"
+        # Fresh cache hits skip the request (and token minting) entirely
+        cached = self._response_cache.get(ResponseCache.key(url, params))
+        if cached is not None:
+            return cached
+        
+        # Add auth token if available; only touch session headers when it rotates
+        token = self._get_auth_token()
+        if token and token != self._session_token:
+            self._session.headers["Authorization"] = f"Bearer {token}"
+            self._session_token = token
+        
+        try:
+            return get_json_cached(self._session, self._response_cache, url, params)
+        except requests.exceptions.RequestException as e:
+            print(f"Error making Kalshi request to {endpoint}: {e}")
+            return None
+    
+    async def _make_request_async(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """Make authenticated request to Kalshi API on the aiohttp session"""
+        url = f"{self.api_base}{endpoint}"
+        cached = self._response_cache.get(ResponseCache.key(url, params))
+        if cached is not None:
+            return cached
+        
         headers = {}
         
-        # Add auth token if available
         token = self._get_auth_token()
         if token:
             headers["Authorization"] = f"Bearer {token}"
         
         try:
-            response = requests.get(url, params=params, headers=headers, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return await self._get_json_async(url, params=params, headers=headers, cache=self._response_cache)
+        except AIO_ERRORS as e:
             print(f"Error making Kalshi request to {endpoint}: {e}")
             return None
     
@@ -115,33 +250,43 @@ class KalshiClient:
         """
         try:
             url = f"https://api.elections.kalshi.com/trade-api/v2/events/{event_ticker}"
-            response = requests.get(url, timeout=10)
+            response = self._session.get(url, timeout=10)
             response.raise_for_status()
-            
-            data = response.json()
-            event_data = data.get('event', {})
-            event_title = event_data.get('title', '')
-            markets = data.get('markets', [])
-            
-            unified_markets = []
-            for market_data in markets:
-                # If market title is empty, use event title
-                if not market_data.get('title'):
-                    market_data['title'] = event_title
-                
-                unified = self._convert_to_unified(market_data)
-                if unified:
-                    unified_markets.append(unified)
-            
-            if unified_markets:
-                print(f"Kalshi: Fetched {len(unified_markets)} market(s) from event '{event_ticker}'")
-            
-            return unified_markets
-            
+            return self._event_markets_to_unified(event_ticker, decode_json(response))
         except Exception as e:
             print(f"Error fetching Kalshi event {event_ticker}: {e}")
             return []
     
+    async def fetch_market_by_event_ticker_async(self, event_ticker: str) -> List[UnifiedMarket]:
+        """Async variant of fetch_market_by_event_ticker"""
+        try:
+            data = await self._get_json_async(f"{self.api_base}/events/{event_ticker}")
+            return self._event_markets_to_unified(event_ticker, data)
+        except Exception as e:
+            print(f"Error fetching Kalshi event {event_ticker}: {e}")
+            return []
+    
+    def _event_markets_to_unified(self, event_ticker: str, data: Dict[str, Any]) -> List[UnifiedMarket]:
+        """Convert the markets of an /events response to unified format"""
+        event_data = data.get('event', {})
+        event_title = event_data.get('title', '')
+        markets = data.get('markets', [])
+        
+        unified_markets = []
+        for market_data in markets:
+            # If market title is empty, use event title
+            if not market_data.get('title'):
+                market_data['title'] = event_title
+            
+            unified = self._convert_to_unified(market_data)
+            if unified:
+                unified_markets.append(unified)
+        
+        if unified_markets:
+            print(f"Kalshi: Fetched {len(unified_markets)} market(s) from event '{event_ticker}'")
+        
+        return unified_markets
+    
     def fetch_markets(self, series_ticker: Optional[str] = None, status: str = "open", limit: int = 100) -> List[UnifiedMarket]:
         """
         Fetch markets from Kalshi
@@ -151,35 +296,57 @@ class KalshiClient:
             status: Market status (open, closed, settled)
             limit: Maximum number of markets to fetch
         """
-        params = {
-            "limit": limit,
-            "status": status
-        }
+        response = self._make_request("/markets", self._markets_params(series_ticker, status, limit))
         
-        if series_ticker:
-            params["series_ticker"] = series_ticker
+        if not response:
+            return []
         
-        response = self._make_request("/markets", params)
+        raw_markets = response.get("markets", [])
+        print(f"Kalshi: Fetched {len(raw_markets)} raw markets")
+        unified_markets = list(self._iter_unified(raw_markets))
+        print(f"Kalshi: Converted {len(unified_markets)} markets to unified format")
+        return unified_markets
+    
+    async def fetch_markets_async(self, series_ticker: Optional[str] = None, status: str = "open", limit: int = 100) -> List[UnifiedMarket]:
+        """
+        Fetch markets from Kalshi without blocking the event loop
+        (see fetch_markets for arguments)
+        """
+        response = await self._make_request_async("/markets", self._markets_params(series_ticker, status, limit))
         
         if not response:
             return []
         
         raw_markets = response.get("markets", [])
         print(f"Kalshi: Fetched {len(raw_markets)} raw markets")
+        # Conversion is CPU-bound; run it in a worker thread so the event loop keeps serving I/O
+        unified_markets = await asyncio.to_thread(lambda: list(self._iter_unified(raw_markets)))
+        print(f"Kalshi: Converted {len(unified_markets)} markets to unified format")
+        return unified_markets
+    
+    @staticmethod
+    def _markets_params(series_ticker: Optional[str], status: str, limit: int) -> Dict[str, Any]:
+        """Build query params for the /markets endpoint"""
+        params = {
+            "limit": limit,
+            "status": status
+        }
         
-        # Convert to unified format
-        unified_markets = []
-        for raw_market in raw_markets:
+        if series_ticker:
+            params["series_ticker"] = series_ticker
+        return params
+    
+    def _iter_unified(self, raw_markets: List[Dict[str, Any]]) -> Iterator[UnifiedMarket]:
+        """Convert raw Kalshi markets to unified format, skipping failures"""
+        prices = _binary_prices(raw_markets)
+        for i, raw_market in enumerate(raw_markets):
             try:
-                unified = self._convert_to_unified(raw_market)
+                unified = self._convert_to_unified(raw_market, prices[i] if prices else None)
                 if unified:
-                    unified_markets.append(unified)
+                    yield unified
             except Exception as e:
                 print(f"Error converting Kalshi market {raw_market.get('ticker', 'unknown')}: {e}")
                 continue
-        
-        print(f"Kalshi: Converted {len(unified_markets)} markets to unified format")
-        return unified_markets
     
     def fetch_market_orderbook(self, ticker: str) -> Optional[Dict]:
         """Fetch orderbook for a specific market"""
@@ -190,8 +357,18 @@ class KalshiClient:
         response = self._make_request(f"/events/{event_ticker}")
         return response.get("event") if response else None
     
-    def _convert_to_unified(self, raw_market: Dict[str, Any]) -> Optional[UnifiedMarket]:
-        """Convert Kalshi market to unified format"""
+    def _convert_to_unified(
+        self,
+        raw_market: Dict[str, Any],
+        prices: Optional[Tuple[float, float]] = None
+    ) -> Optional[UnifiedMarket]:
+        """
+        Convert Kalshi market to unified format
+        
+        Args:
+            raw_market: Market dict from the Kalshi API
+            prices: Precomputed (yes_price, no_price) from _binary_prices, if available
+        """
         try:
             # Extract basic info
             ticker = raw_market.get("ticker")
@@ -206,22 +383,30 @@ class KalshiClient:
             if not ticker or not question:
                 return None
             
+            # Fields read more than once below
+            yes_ask = raw_market.get("yes_ask", 0)
+            no_ask = raw_market.get("no_ask", 0)
+            volume = raw_market.get("volume")
+            
             # Kalshi markets are binary (Yes/No)
             # Use ASK prices (what you'd pay to BUY) for comparison
-            yes_price = raw_market.get("yes_ask", 0) / 100.0  # Convert cents to probability
-            no_price = raw_market.get("no_ask", 0) / 100.0
-            
-            # If no ask prices, use last prices as fallback
-            if yes_price == 0:
-                yes_price = raw_market.get("last_price", 50) / 100.0
-            if no_price == 0:
-                no_price = 1.0 - yes_price
-            
-            # Ensure prices are valid
-            if yes_price <= 0 or yes_price >= 1:
-                yes_price = 0.5
-            if no_price <= 0 or no_price >= 1:
-                no_price = 0.5
+            if prices:
+                yes_price, no_price = prices
+            else:
+                yes_price = yes_ask / 100.0  # Convert cents to probability
+                no_price = no_ask / 100.0
+                
+                # If no ask prices, use last prices as fallback
+                if yes_price == 0:
+                    yes_price = raw_market.get("last_price", 50) / 100.0
+                if no_price == 0:
+                    no_price = 1.0 - yes_price
+                
+                # Ensure prices are valid
+                if yes_price <= 0 or yes_price >= 1:
+                    yes_price = 0.5
+                if no_price <= 0 or no_price >= 1:
+                    no_price = 0.5
             
             # Create outcomes
             market_outcomes = [
@@ -231,8 +416,8 @@ class KalshiClient:
                     decimal_odds=calculate_decimal_odds(yes_price),
                     american_odds=calculate_american_odds(yes_price),
                     best_bid=raw_market.get("yes_bid", 0) / 100.0,
-                    best_ask=raw_market.get("yes_ask", 0) / 100.0,
-                    volume=raw_market.get("volume")
+                    best_ask=yes_ask / 100.0,
+                    volume=volume
                 ),
                 MarketOutcome(
                     name="No",
@@ -240,8 +425,8 @@ class KalshiClient:
                     decimal_odds=calculate_decimal_odds(no_price),
                     american_odds=calculate_american_odds(no_price),
                     best_bid=raw_market.get("no_bid", 0) / 100.0,
-                    best_ask=raw_market.get("no_ask", 0) / 100.0,
-                    volume=raw_market.get("volume")
+                    best_ask=no_ask / 100.0,
+                    volume=volume
                 )
             ]
             
@@ -256,24 +441,20 @@ class KalshiClient:
             game_time = raw_market.get("expected_expiration_time")
             if game_time:
                 try:
-                    start_time = datetime.fromisoformat(game_time.replace('Z', '+00:00'))
-                except:
+                    start_time = parse_iso_datetime(game_time)
+                except (TypeError, ValueError, OverflowError):
                     pass
             
             close_time = raw_market.get("close_time")
             if close_time:
                 try:
-                    end_time = datetime.fromisoformat(close_time.replace('Z', '+00:00'))
-                except:
+                    end_time = parse_iso_datetime(close_time)
+                except (TypeError, ValueError, OverflowError):
                     pass
             
             # Extract category
             category = raw_market.get("category")
             
-            # Create normalized title and extract teams
-            normalized_title = normalize_market_title(question)
-            normalized_teams = extract_team_names(question)
-            
             # Determine if market is active/closed
             status = raw_market.get("status", "")
             is_active = status == "open"
@@ -289,13 +470,13 @@ class KalshiClient:
                 end_time=end_time,
                 category=category,
                 subcategory=raw_market.get("series_ticker"),
-                total_volume=raw_market.get("volume"),
-                liquidity=float(raw_market.get("liquidity_dollars", "0").replace(",", "")) if raw_market.get("liquidity_dollars") else raw_market.get("liquidity", 0),
+                total_volume=volume,
+                liquidity=_parse_liquidity(raw_market),
+                yes_sub_title=raw_market.get("yes_sub_title") or "",
+                subtitle=raw_market.get("subtitle") or "",
                 is_active=is_active,
                 is_closed=is_closed,
-                raw_data=raw_market,
-                normalized_title=normalized_title,
-                normalized_teams=normalized_teams
+                raw_data=raw_market
             )
             
             # Store additional stats in raw_data for easy access
@@ -316,26 +497,24 @@ class KalshiClient:
         ticker = raw_market.get("ticker", "").lower()
         title = raw_market.get("title", "").lower()
         
-        # Check for sports keywords
-        sports_keywords = ["nfl", "nba", "mlb", "nhl", "game", "match", "football", "basketball", "soccer"]
-        if any(kw in event_ticker or kw in ticker or kw in title or kw in category for kw in sports_keywords):
+        # One regex scan per category over all fields; "\n" keeps matches from spanning fields
+        haystack = "\n".join((event_ticker, ticker, title))
+        
+        if _SPORTS_PATTERN.search(haystack) or _SPORTS_PATTERN.search(category):
             return MarketType.SPORTS
         
-        # Check for politics keywords
-        politics_keywords = ["election", "president", "senate", "congress", "politics"]
-        if any(kw in event_ticker or kw in ticker or kw in title or kw in category for kw in politics_keywords):
+        if _POLITICS_PATTERN.search(haystack) or _POLITICS_PATTERN.search(category):
             return MarketType.POLITICS
         
-        # Check for crypto keywords
-        crypto_keywords = ["crypto", "bitcoin", "btc", "ethereum", "eth"]
-        if any(kw in event_ticker or kw in ticker or kw in title for kw in crypto_keywords):
+        # Crypto deliberately ignores category
+        if _CRYPTO_PATTERN.search(haystack):
             return MarketType.CRYPTO
         
         return MarketType.OTHER
 
 
 if __name__ == "__main__":
-    # Test the client
+    # Test the client (run from the service directory: python -m api_clients.kalshi_client)
     client = KalshiClient()
     
     # Fetch open markets
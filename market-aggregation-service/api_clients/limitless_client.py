@@ -1,27 +1,51 @@
 """
 Limitless Exchange API Client
 """
+import asyncio
+import re
 import requests
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from dateutil import parser as date_parser
-import sys
-import os
 
-# Add parent directory to path to import models
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import (
     UnifiedMarket, MarketOutcome, Platform, MarketType,
-    calculate_decimal_odds, calculate_american_odds,
-    normalize_market_title, extract_team_names
+    calculate_decimal_odds, calculate_american_odds, parse_iso_datetime
 )
+from api_clients.http_session import AIO_ERRORS, AsyncSessionMixin, ResponseCache, create_session, decode_json, get_json_cached
 
-class LimitlessClient:
+# Only these identifying fields are kept on UnifiedMarket.raw_data; nothing
+# downstream reads the rest of the Limitless payload, so it isn't retained
+LIMITLESS_RAW_KEYS = ("id", "slug", "address", "status")
+
+# Market type keywords, matched as plain substrings
+_SPORTS_PATTERN = re.compile("|".join(map(re.escape, [
+    "sports", "nfl", "nba", "mlb", "nhl", "game", "match", "football", "basketball", "soccer"
+])))
+_POLITICS_PATTERN = re.compile("|".join(map(re.escape, [
+    "politics", "election", "president", "senate", "congress"
+])))
+_CRYPTO_PATTERN = re.compile("|".join(map(re.escape, [
+    "crypto", "bitcoin", "btc", "ethereum", "eth", "defi"
+])))
+
+class LimitlessClient(AsyncSessionMixin):
     """Client for interacting with Limitless Exchange API"""
     
     def __init__(self):
         self.api_base = "https://api.limitless.exchange"
+        self._session = create_session()
+        self._response_cache = ResponseCache()
         
+    def close(self):
+        """Close the underlying HTTP session"""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def fetch_markets(
         self,
         chain_id: int = 2,  # Base chain by default
@@ -44,48 +68,82 @@ class LimitlessClient:
             "limit": limit,
             "sortBy": sort_by
         }
-        
         try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract markets from response
-            raw_markets = data.get("data", []) if isinstance(data, dict) else data
-            print(f"Limitless: Fetched {len(raw_markets)} raw markets")
-            
-            # Convert to unified format
-            unified_markets = []
-            for raw_market in raw_markets:
-                try:
-                    unified = self._convert_to_unified(raw_market)
-                    if unified:
-                        unified_markets.append(unified)
-                except Exception as e:
-                    print(f"Error converting Limitless market {raw_market.get('id', 'unknown')}: {e}")
-                    continue
-            
-            print(f"Limitless: Converted {len(unified_markets)} markets to unified format")
-            return unified_markets
-            
+            data = get_json_cached(self._session, self._response_cache, url, params)
+            return self._unified_from_response(data)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching Limitless markets: {e}")
             return []
     
+    async def fetch_markets_async(
+        self,
+        chain_id: int = 2,
+        page: int = 1,
+        limit: int = 100,
+        sort_by: str = "newest"
+    ) -> List[UnifiedMarket]:
+        """Async variant of fetch_markets (see fetch_markets for arguments)"""
+        url = f"{self.api_base}/markets/active/{chain_id}"
+        params = {
+            "page": page,
+            "limit": limit,
+            "sortBy": sort_by
+        }
+        try:
+            data = await self._get_json_async(url, params=params, cache=self._response_cache)
+        except AIO_ERRORS as e:
+            print(f"Error fetching Limitless markets: {e}")
+            return []
+        
+        # Conversion is CPU-bound; run it in a worker thread so the event loop keeps serving I/O
+        return await asyncio.to_thread(self._unified_from_response, data)
+    
+    def _unified_from_response(self, data: Any) -> List[UnifiedMarket]:
+        """Convert an active-markets response to unified format"""
+        # Extract markets from response
+        raw_markets = data.get("data", []) if isinstance(data, dict) else data
+        print(f"Limitless: Fetched {len(raw_markets)} raw markets")
+        
+        # Convert to unified format
+        unified_markets = []
+        for raw_market in raw_markets:
+            try:
+                unified = self._convert_to_unified(raw_market)
+                if unified:
+                    unified_markets.append(unified)
+            except Exception as e:
+                print(f"Error converting Limitless market {raw_market.get('id', 'unknown')}: {e}")
+                continue
+        
+        print(f"Limitless: Converted {len(unified_markets)} markets to unified format")
+        return unified_markets
+    
     def fetch_market_by_id(self, market_id: str, chain_id: int = 2) -> Optional[UnifiedMarket]:
         """Fetch a single market by ID"""
         url = f"{self.api_base}/markets/{market_id}"
         params = {"chainId": chain_id}
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = self._session.get(url, params=params, timeout=30)
             response.raise_for_status()
-            raw_market = response.json()
+            raw_market = decode_json(response)
             return self._convert_to_unified(raw_market)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching Limitless market {market_id}: {e}")
             return None
     
+    async def fetch_market_by_id_async(self, market_id: str, chain_id: int = 2) -> Optional[UnifiedMarket]:
+        """Async variant of fetch_market_by_id using the shared aiohttp session"""
+        url = f"{self.api_base}/markets/{market_id}"
+        params = {"chainId": chain_id}
+        
+        try:
+            raw_market = await self._get_json_async(url, params=params)
+        except AIO_ERRORS as e:
+            print(f"Error fetching Limitless market {market_id}: {e}")
+            return None
+        return self._convert_to_unified(raw_market)
+    
     def _convert_to_unified(self, raw_market: Dict[str, Any]) -> Optional[UnifiedMarket]:
         """Convert Limitless market to unified format"""
         try:
@@ -100,6 +158,7 @@ class LimitlessClient:
             # Limitless typically has binary outcomes with prices
             outcomes_data = raw_market.get("outcomes", [])
             prices = raw_market.get("prices", [])
+            volume = raw_market.get("volumeFormatted")
             
             # If no explicit outcomes, assume binary Yes/No
             if not outcomes_data:
@@ -127,7 +186,7 @@ class LimitlessClient:
                     price=price,
                     decimal_odds=decimal_odds,
                     american_odds=american_odds,
-                    volume=raw_market.get("volumeFormatted")
+                    volume=volume
                 ))
             
             # If we still don't have outcomes, create default binary outcomes
@@ -140,14 +199,14 @@ class LimitlessClient:
                             price=price,
                             decimal_odds=calculate_decimal_odds(price),
                             american_odds=calculate_american_odds(price),
-                            volume=raw_market.get("volumeFormatted")
+                            volume=volume
                         ),
                         MarketOutcome(
                             name="No",
                             price=1.0 - price,
                             decimal_odds=calculate_decimal_odds(1.0 - price),
                             american_odds=calculate_american_odds(1.0 - price),
-                            volume=raw_market.get("volumeFormatted")
+                            volume=volume
                         )
                     ]
             
@@ -164,24 +223,20 @@ class LimitlessClient:
             created_at = raw_market.get("createdAt")
             if created_at:
                 try:
-                    start_time = date_parser.parse(created_at) if isinstance(created_at, str) else datetime.fromtimestamp(created_at)
-                except:
+                    start_time = parse_iso_datetime(created_at) if isinstance(created_at, str) else datetime.fromtimestamp(created_at)
+                except (TypeError, ValueError, OverflowError, OSError):
                     pass
             
             deadline = raw_market.get("deadline") or raw_market.get("expirationDate")
             if deadline:
                 try:
-                    end_time = date_parser.parse(deadline) if isinstance(deadline, str) else datetime.fromtimestamp(deadline)
-                except:
+                    end_time = parse_iso_datetime(deadline) if isinstance(deadline, str) else datetime.fromtimestamp(deadline)
+                except (TypeError, ValueError, OverflowError, OSError):
                     pass
             
             # Extract category
             category = raw_market.get("category") or raw_market.get("tags", [""])[0] if raw_market.get("tags") else None
             
-            # Create normalized title and extract teams
-            normalized_title = normalize_market_title(question)
-            normalized_teams = extract_team_names(question)
-            
             # Check if market is active
             is_active = raw_market.get("status") != "closed" and raw_market.get("active", True)
             is_closed = raw_market.get("status") == "closed" or raw_market.get("closed", False)
@@ -195,13 +250,11 @@ class LimitlessClient:
                 start_time=start_time,
                 end_time=end_time,
                 category=category,
-                total_volume=raw_market.get("volumeFormatted"),
+                total_volume=volume,
                 liquidity=raw_market.get("liquidity"),
                 is_active=is_active,
                 is_closed=is_closed,
-                raw_data=raw_market,
-                normalized_title=normalized_title,
-                normalized_teams=normalized_teams
+                raw_data={key: raw_market[key] for key in LIMITLESS_RAW_KEYS if key in raw_market}
             )
             
             return unified
@@ -216,26 +269,23 @@ class LimitlessClient:
         title = raw_market.get("title", "").lower()
         tags = [tag.lower() for tag in raw_market.get("tags", [])]
         
-        # Check for sports keywords
-        sports_keywords = ["sports", "nfl", "nba", "mlb", "nhl", "game", "match", "football", "basketball", "soccer"]
-        if any(kw in category or kw in title or any(kw in tag for tag in tags) for kw in sports_keywords):
+        # One regex scan per category over all fields; "\n" keeps matches from spanning fields
+        haystack = "\n".join([category, title, *tags])
+        
+        if _SPORTS_PATTERN.search(haystack):
             return MarketType.SPORTS
         
-        # Check for politics keywords
-        politics_keywords = ["politics", "election", "president", "senate", "congress"]
-        if any(kw in category or kw in title or any(kw in tag for tag in tags) for kw in politics_keywords):
+        if _POLITICS_PATTERN.search(haystack):
             return MarketType.POLITICS
         
-        # Check for crypto keywords
-        crypto_keywords = ["crypto", "bitcoin", "btc", "ethereum", "eth", "defi"]
-        if any(kw in category or kw in title or any(kw in tag for tag in tags) for kw in crypto_keywords):
+        if _CRYPTO_PATTERN.search(haystack):
             return MarketType.CRYPTO
         
         return MarketType.OTHER
 
 
 if __name__ == "__main__":
-    # Test the client
+    # Test the client (run from the service directory: python -m api_clients.limitless_client)
     client = LimitlessClient()
     
     # Fetch markets from Base chain
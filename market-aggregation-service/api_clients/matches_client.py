@@ -0,0 +1,29 @@
+"""
+Client for the external matched-markets API (Polymarket <-> Kalshi pairs)
+"""
+from typing import Any, Dict
+
+from api_clients.http_session import AsyncSessionMixin
+
+# Matches pages are small; anything past this is an upstream fault, not data
+MATCHES_MAX_RESPONSE_BYTES = 4 * 1024 * 1024
+
+
+class MatchesClient(AsyncSessionMixin):
+    """Async client for the monitorthesituation.lol matches API"""
+
+    def __init__(self, max_response_bytes: int = MATCHES_MAX_RESPONSE_BYTES):
+        self.api_base = "https://monitorthesituation.lol/api/bff"
+        self._aio_headers = {"accept": "*/*"}
+        self._max_response_bytes = max_response_bytes
+
+    async def fetch_matches_async(self, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
+        """
+        Fetch one page of matched markets (best match per source market)
+
+        Raises the exceptions in http_session.AIO_ERRORS on HTTP/decode errors,
+        including ResponseTooLargeError for bodies over max_response_bytes.
+        """
+        url = f"{self.api_base}/matches"
+        params = {"top_k": 1, "limit": limit, "offset": offset}
+        return await self._get_json_async(url, params=params) or {}
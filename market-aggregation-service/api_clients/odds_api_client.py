@@ -1,19 +1,45 @@
 """
 The Odds API Client for traditional sportsbooks
 """
+import asyncio
+import os
 import requests
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime
 from models import UnifiedMarket, MarketOutcome, MarketType, Platform
+from api_clients.http_session import (
+    AIO_ERRORS, AsyncSessionMixin, RateLimiter, ResponseCache, create_session, get_json_cached,
+    iter_json_array
+)
 
+NFL_SPORT_KEY = "americanfootball_nfl"
 
-class OddsAPIClient:
+# Every Odds API request spends quota; keep bursts well under its rate limit
+ODDS_API_REQUESTS_PER_SECOND = 5
+
+
+class OddsAPIClient(AsyncSessionMixin):
     """Client for The Odds API to fetch traditional sportsbook odds"""
     
-    def __init__(self, api_key: str):
-        self.api_key = api_key
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key or os.getenv("ODDS_API_KEY")
+        if not self.api_key:
+            print("Warning: ODDS_API_KEY environment variable not set. OddsAPIClient will not work.")
         self.base_url = "https://api.the-odds-api.com/v4"
+        self._rate_limiter = RateLimiter(ODDS_API_REQUESTS_PER_SECOND)
+        self._session = create_session(rate_limiter=self._rate_limiter)
+        self._response_cache = ResponseCache()
     
+    def close(self):
+        """Close the underlying HTTP session"""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def fetch_nfl_odds(self) -> List[Dict[str, Any]]:
         """
         Fetch NFL H2H odds from The Odds API
@@ -21,20 +47,33 @@ class OddsAPIClient:
         Returns:
             List of games with odds from multiple bookmakers
         """
-        url = f"{self.base_url}/sports/americanfootball_nfl/odds/"
-        params = {
-            'apiKey': self.api_key,
-            'regions': 'us,us2',
-            'markets': 'h2h'
-        }
+        return self.fetch_odds(NFL_SPORT_KEY)
+    
+    async def fetch_nfl_odds_async(self) -> List[Dict[str, Any]]:
+        """Async variant of fetch_nfl_odds using the shared aiohttp session"""
+        return await self.fetch_odds_async(NFL_SPORT_KEY)
+    
+    def fetch_odds(self, sport_key: str, markets: str = 'h2h', regions: str = 'us,us2') -> List[Dict[str, Any]]:
+        """
+        Fetch odds for one sport from The Odds API
         
-        try:
-            print(f"📡 Fetching NFL odds from The Odds API...")
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
+        Args:
+            sport_key: Odds API sport key (e.g., "americanfootball_nfl")
+            markets: Comma-separated market keys (h2h, spreads, totals)
+            regions: Comma-separated bookmaker regions
             
-            games = response.json()
-            print(f"✅ Fetched {len(games)} NFL games from The Odds API")
+        Returns:
+            List of games with odds from multiple bookmakers
+        """
+        url, params = self._odds_request(sport_key, markets, regions)
+        cached = self._response_cache.get(ResponseCache.key(url, params))
+        if cached is not None:
+            return cached
+        
+        try:
+            print(f"📡 Fetching {sport_key} {markets} odds from The Odds API...")
+            games = get_json_cached(self._session, self._response_cache, url, params)
+            print(f"✅ Fetched {len(games)} {sport_key} games from The Odds API")
             
             return games
             
@@ -42,27 +81,111 @@ class OddsAPIClient:
             print(f"❌ Error fetching from The Odds API: {e}")
             return []
     
-    def get_best_odds_for_game(self, game: Dict[str, Any]) -> Dict[str, Any]:
+    def iter_nfl_odds(self) -> Iterator[Dict[str, Any]]:
+        """Streaming variant of fetch_nfl_odds (see iter_odds)"""
+        return self.iter_odds(NFL_SPORT_KEY)
+    
+    def iter_odds(self, sport_key: str, markets: str = 'h2h', regions: str = 'us,us2') -> Iterator[Dict[str, Any]]:
         """
-        Find the best odds for each team across all bookmakers
+        Stream games for one sport, yielding each as soon as it is decoded
+        
+        Unlike fetch_odds the body is never held in full, so this bypasses the
+        response cache; use it for one-pass consumers of large slates.
+        
+        Args:
+            sport_key: Odds API sport key (e.g., "americanfootball_nfl")
+            markets: Comma-separated market keys (h2h, spreads, totals)
+            regions: Comma-separated bookmaker regions
+            
+        Yields:
+            Game dicts with odds from multiple bookmakers
+        """
+        url, params = self._odds_request(sport_key, markets, regions)
+        count = 0
+        try:
+            print(f"📡 Streaming {sport_key} {markets} odds from The Odds API...")
+            with self._session.get(url, params=params, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                for game in iter_json_array(response):
+                    count += 1
+                    yield game
+            print(f"✅ Streamed {count} {sport_key} games from The Odds API")
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Error fetching from The Odds API: {e}")
+    
+    async def fetch_odds_async(self, sport_key: str, markets: str = 'h2h', regions: str = 'us,us2') -> List[Dict[str, Any]]:
+        """Async variant of fetch_odds (see fetch_odds for arguments)"""
+        url, params = self._odds_request(sport_key, markets, regions)
+        cached = self._response_cache.get(ResponseCache.key(url, params))
+        if cached is not None:
+            return cached
+        
+        try:
+            print(f"📡 Fetching {sport_key} {markets} odds from The Odds API...")
+            games = await self._get_json_async(url, params=params, cache=self._response_cache)
+            print(f"✅ Fetched {len(games)} {sport_key} games from The Odds API")
+            return games
+        except AIO_ERRORS as e:
+            print(f"❌ Error fetching from The Odds API: {e}")
+            return []
+    
+    async def fetch_odds_many_async(
+        self,
+        endpoints: List[Tuple[str, str]],
+        regions: str = 'us,us2'
+    ) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+        """
+        Fetch several (sport_key, markets) odds endpoints concurrently
+        
+        Requests share the client's pooled keep-alive connections, so the
+        TLS handshake is paid once rather than per endpoint.
+        
+        Returns:
+            Mapping of (sport_key, markets) -> list of games
+        """
+        results = await asyncio.gather(*(
+            self.fetch_odds_async(sport_key, markets, regions) for sport_key, markets in endpoints
+        ))
+        return dict(zip(endpoints, results))
+    
+    def _odds_request(self, sport_key: str, markets: str, regions: str) -> Tuple[str, Dict[str, Any]]:
+        """URL and query params for a sport's odds endpoint"""
+        url = f"{self.base_url}/sports/{sport_key}/odds/"
+        params = {
+            'apiKey': self.api_key,
+            'regions': regions,
+            'markets': markets
+        }
+        return url, params
+    
+    def get_odds_for_game(self, game: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Collect best odds and per-bookmaker odds for a game in a single pass
         
         Args:
             game: Game data with bookmakers
             
         Returns:
-            Dictionary with best odds information
+            (best odds dict as in get_best_odds_for_game,
+             per-bookmaker list as in get_all_odds_for_game)
         """
         home_team = game.get('home_team', '')
         away_team = game.get('away_team', '')
+        bookmakers = game.get('bookmakers', [])
         
         best_home_odds = None
         best_home_platform = None
         best_away_odds = None
         best_away_platform = None
+        all_odds = []
         
-        for bookmaker in game.get('bookmakers', []):
+        for bookmaker in bookmakers:
             platform_name = bookmaker.get('title', bookmaker.get('key', ''))
             
+            # Last h2h price seen for each side at this bookmaker
+            home_odds = None
+            away_odds = None
+            
             for market in bookmaker.get('markets', []):
                 if market.get('key') != 'h2h':
                     continue
@@ -72,15 +195,30 @@ class OddsAPIClient:
                     price = outcome.get('price', 0)
                     
                     if team_name == home_team:
+                        home_odds = price
                         if best_home_odds is None or price > best_home_odds:
                             best_home_odds = price
                             best_home_platform = platform_name
                     elif team_name == away_team:
+                        away_odds = price
                         if best_away_odds is None or price > best_away_odds:
                             best_away_odds = price
                             best_away_platform = platform_name
+            
+            if home_odds and away_odds:
+                all_odds.append({
+                    'platform': platform_name,
+                    'platform_key': bookmaker.get('key', ''),
+                    'home_team': home_team,
+                    'away_team': away_team,
+                    'home_odds': home_odds,
+                    'away_odds': away_odds,
+                    'home_probability': self.convert_decimal_to_probability(home_odds),
+                    'away_probability': self.convert_decimal_to_probability(away_odds),
+                    'last_update': bookmaker.get('last_update', '')
+                })
         
-        return {
+        best_odds = {
             'home_team': home_team,
             'away_team': away_team,
             'commence_time': game.get('commence_time'),
@@ -89,8 +227,21 @@ class OddsAPIClient:
             'best_away_odds': best_away_odds,
             'best_away_platform': best_away_platform,
             'game_id': game.get('id', ''),
-            'total_bookmakers': len(game.get('bookmakers', []))
+            'total_bookmakers': len(bookmakers)
         }
+        return best_odds, all_odds
+    
+    def get_best_odds_for_game(self, game: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Find the best odds for each team across all bookmakers
+        
+        Args:
+            game: Game data with bookmakers
+            
+        Returns:
+            Dictionary with best odds information
+        """
+        return self.get_odds_for_game(game)[0]
     
     def convert_decimal_to_probability(self, decimal_odds: float) -> float:
         """
@@ -116,42 +267,4 @@ class OddsAPIClient:
         Returns:
             List of odds from all bookmakers
         """
-        home_team = game.get('home_team', '')
-        away_team = game.get('away_team', '')
-        all_odds = []
-        
-        for bookmaker in game.get('bookmakers', []):
-            platform_name = bookmaker.get('title', bookmaker.get('key', ''))
-            last_update = bookmaker.get('last_update', '')
-            
-            home_odds = None
-            away_odds = None
-            
-            for market in bookmaker.get('markets', []):
-                if market.get('key') != 'h2h':
-                    continue
-                    
-                for outcome in market.get('outcomes', []):
-                    team_name = outcome.get('name', '')
-                    price = outcome.get('price', 0)
-                    
-                    if team_name == home_team:
-                        home_odds = price
-                    elif team_name == away_team:
-                        away_odds = price
-            
-            if home_odds and away_odds:
-                all_odds.append({
-                    'platform': platform_name,
-                    'platform_key': bookmaker.get('key', ''),
-                    'home_team': home_team,
-                    'away_team': away_team,
-                    'home_odds': home_odds,
-                    'away_odds': away_odds,
-                    'home_probability': self.convert_decimal_to_probability(home_odds),
-                    'away_probability': self.convert_decimal_to_probability(away_odds),
-                    'last_update': last_update
-                })
-        
-        return all_odds
-
+        return self.get_odds_for_game(game)[1]
@@ -1,83 +1,109 @@
 """
 Polymarket API Client
 """
+import asyncio
+import re
+import time
+import orjson
 import requests
-import json
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Hashable, Iterator, Tuple
 from datetime import datetime
-from dateutil import parser as date_parser
-import sys
-import os
 
-# Add parent directory to path to import models
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models import (
     UnifiedMarket, MarketOutcome, Platform, MarketType,
-    calculate_decimal_odds, calculate_american_odds,
-    normalize_market_title, extract_team_names
+    calculate_decimal_odds, calculate_american_odds, calculate_odds_batch, parse_iso_datetime
 )
+from api_clients.http_session import (
+    AIO_ERRORS, AsyncSessionMixin, RateLimiter, ResponseCache, create_session, decode_json,
+    get_json_cached, iter_json_array
+)
+
+# Self-throttle across Gamma and CLOB so endpoint fan-out doesn't trip 429s
+POLYMARKET_REQUESTS_PER_SECOND = 10
+
+# Tag label keywords, matched as plain substrings
+_SPORTS_TAG_PATTERN = re.compile("|".join(map(re.escape, [
+    "nfl", "nba", "mlb", "nhl", "soccer", "football", "basketball", "tennis", "ufc", "mma"
+])))
+_POLITICS_TAG_PATTERN = re.compile("politics|election")
+_CRYPTO_TAG_PATTERN = re.compile("crypto|bitcoin|ethereum")
+
+def _parse_outcome_prices(raw_market: Dict[str, Any]) -> List[Tuple[Any, float]]:
+    """
+    (outcome name, price) pairs from a Gamma market's outcomes/outcomePrices
+    JSON strings, keeping only prices strictly between 0 and 1
+    
+    Returns an empty list when the fields are missing, malformed or mismatched.
+    """
+    outcomes_str = raw_market.get("outcomes", "[]")
+    prices_str = raw_market.get("outcomePrices", "[]")
+    
+    try:
+        outcomes = orjson.loads(outcomes_str) if isinstance(outcomes_str, str) else outcomes_str
+        prices = orjson.loads(prices_str) if isinstance(prices_str, str) else prices_str
+    except orjson.JSONDecodeError:
+        return []
+    
+    if not outcomes or not prices or len(outcomes) != len(prices):
+        return []
+    
+    parsed = []
+    for outcome_name, price_str in zip(outcomes, prices):
+        try:
+            price = float(price_str)
+        except (ValueError, TypeError):
+            continue
+        if 0 < price < 1:
+            parsed.append((outcome_name, price))
+    return parsed
+
+def outcome_token_ids(raw_market: Dict[str, Any]) -> Dict[Any, str]:
+    """
+    outcome name -> CLOB token id from a Gamma market's outcomes/clobTokenIds
+
+    Returns an empty dict when the fields are missing, malformed or mismatched.
+    """
+    try:
+        outcomes = raw_market.get("outcomes", "[]")
+        token_ids = raw_market.get("clobTokenIds", "[]")
+        outcomes = orjson.loads(outcomes) if isinstance(outcomes, str) else outcomes
+        token_ids = orjson.loads(token_ids) if isinstance(token_ids, str) else token_ids
+    except orjson.JSONDecodeError:
+        return {}
+    if not outcomes or not token_ids or len(outcomes) != len(token_ids):
+        return {}
+    return dict(zip(outcomes, token_ids))
 
-class PolymarketClient:
+class PolymarketClient(AsyncSessionMixin):
     """Client for interacting with Polymarket Gamma API"""
     
     def __init__(self):
         self.gamma_api_base = "https://gamma-api.polymarket.com"
         self.clob_api_base = "https://clob.polymarket.com"
+        self._rate_limiter = RateLimiter(POLYMARKET_REQUESTS_PER_SECOND)
+        self._session = create_session(rate_limiter=self._rate_limiter)
+        self._response_cache = ResponseCache()
+        # Response cache key -> (raw markets payload, markets converted from it)
+        self._unified_cache: Dict[Hashable, Tuple[List[Dict[str, Any]], List[UnifiedMarket]]] = {}
+        # CLOB token ID -> (outcome price from a Gamma listing, time.monotonic() when recorded)
+        self._token_prices: Dict[str, Tuple[float, float]] = {}
     
-    def fetch_market_by_id(self, condition_id: str) -> Optional[UnifiedMarket]:
-        """
-        Fetch a specific market by condition ID with detailed volume/liquidity data
-        
-        Args:
-            condition_id: The condition ID (e.g., 0x576ddfc4a6f4641d33af22a70c5c533f6ff52d1b0bf3bf127ebdc30c7f573b85)
-        
-        Returns:
-            UnifiedMarket or None if not found
-        """
-        try:
-            # First, get the basic market data
-            url = f"https://clob.polymarket.com/markets/{condition_id}"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            market_data = response.json()
-            unified = self._convert_to_unified(market_data)
-            
-            if not unified:
-                return None
-            
-            # Now fetch detailed volume/liquidity from the slug endpoint
-            slug = market_data.get('market_slug')
-            if slug:
-                try:
-                    gamma_url = f"https://gamma-api.polymarket.com/events/slug/{slug}"
-                    gamma_response = requests.get(gamma_url, timeout=10)
-                    gamma_response.raise_for_status()
-                    gamma_data = gamma_response.json()
-                    
-                    # Update volume and liquidity from gamma API
-                    unified.total_volume = gamma_data.get('volume', 0)
-                    unified.liquidity = gamma_data.get('liquidity', 0)
-                    
-                    # Store additional stats in raw_data
-                    unified.raw_data['volume_24hr'] = gamma_data.get('volume24hr', 0)
-                    unified.raw_data['volume_1wk'] = gamma_data.get('volume1wk', 0)
-                    unified.raw_data['volume_1mo'] = gamma_data.get('volume1mo', 0)
-                    unified.raw_data['open_interest'] = gamma_data.get('openInterest', 0)
-                    
-                    print(f"Polymarket: Fetched market '{unified.question}' (Vol: ${unified.total_volume:.0f}, Liq: ${unified.liquidity:.0f})")
-                except Exception as e:
-                    print(f"  ⚠️  Could not fetch detailed stats: {e}")
-                    print(f"Polymarket: Fetched market '{unified.question}'")
-            else:
-                print(f"Polymarket: Fetched market '{unified.question}'")
-            
-            return unified
-            
-        except Exception as e:
-            print(f"Error fetching Polymarket market {condition_id[:20]}...: {e}")
-            return None
-        
+    def invalidate_cache(self):
+        """Drop cached responses and converted markets so the next fetch hits the API"""
+        self._response_cache.clear()
+        self._unified_cache.clear()
+        self._token_prices.clear()
+    
+    def close(self):
+        """Close the underlying HTTP session"""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def fetch_markets(
         self,
         limit: int = 100,
@@ -95,9 +121,100 @@ class PolymarketClient:
             active: Whether to include only active markets
             tag_id: Filter by tag ID (category)
             start_date_min: Minimum start date filter
+        
+        While the response cache returns the same payload, every call gets the
+        same UnifiedMarket objects (fetched_at and raw_data included). Callers
+        must not mutate them; use dataclasses.replace for a modified copy.
         """
         url = f"{self.gamma_api_base}/markets"
+        params = self._markets_params(limit, closed, active, tag_id, start_date_min)
+            
+        try:
+            raw_markets = get_json_cached(self._session, self._response_cache, url, params)
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching Polymarket markets: {e}")
+            return []
         
+        print(f"Polymarket: Fetched {len(raw_markets)} raw markets")
+        unified_markets = list(self._iter_unified_cached(ResponseCache.key(url, params), raw_markets))
+        print(f"Polymarket: Converted {len(unified_markets)} markets to unified format")
+        return unified_markets
+    
+    def fetch_markets_stream(
+        self,
+        limit: int = 100,
+        closed: bool = False,
+        active: bool = True,
+        tag_id: Optional[int] = None,
+        start_date_min: Optional[str] = None
+    ) -> Iterator[UnifiedMarket]:
+        """
+        Stream markets from Polymarket, converting each one as soon as it is
+        decoded from the response body (see fetch_markets for arguments)
+        
+        The body is never held in full, which keeps memory flat for large
+        one-pass pulls (limit in the hundreds or more). This bypasses the
+        response cache and the batched odds calculation; repeated or small
+        fetches should use fetch_markets.
+        """
+        url = f"{self.gamma_api_base}/markets"
+        params = self._markets_params(limit, closed, active, tag_id, start_date_min)
+        
+        count = 0
+        try:
+            with self._session.get(url, params=params, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                for raw_market in iter_json_array(response):
+                    count += 1
+                    unified = self._convert_to_unified(raw_market)
+                    if unified:
+                        yield unified
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching Polymarket markets: {e}")
+            return
+        
+        print(f"Polymarket: Streamed {count} raw markets")
+    
+    async def fetch_markets_async(
+        self,
+        limit: int = 100,
+        closed: bool = False,
+        active: bool = True,
+        tag_id: Optional[int] = None,
+        start_date_min: Optional[str] = None
+    ) -> List[UnifiedMarket]:
+        """
+        Fetch markets from Polymarket without blocking the event loop
+        (see fetch_markets for arguments; the returned markets are shared and
+        must not be mutated)
+        """
+        url = f"{self.gamma_api_base}/markets"
+        params = self._markets_params(limit, closed, active, tag_id, start_date_min)
+        
+        try:
+            raw_markets = await self._get_json_async(url, params=params, cache=self._response_cache)
+        except AIO_ERRORS as e:
+            print(f"Error fetching Polymarket markets: {e}")
+            return []
+        
+        print(f"Polymarket: Fetched {len(raw_markets)} raw markets")
+        # Conversion is CPU-bound; run it in a worker thread so the event loop keeps serving I/O
+        key = ResponseCache.key(url, params)
+        unified_markets = self._cached_unified(key, raw_markets)
+        if unified_markets is None:
+            unified_markets = await asyncio.to_thread(lambda: list(self._iter_unified_cached(key, raw_markets)))
+        print(f"Polymarket: Converted {len(unified_markets)} markets to unified format")
+        return unified_markets
+    
+    @staticmethod
+    def _markets_params(
+        limit: int,
+        closed: bool,
+        active: bool,
+        tag_id: Optional[int],
+        start_date_min: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build query params for the Gamma /markets endpoint"""
         params = {
             "limit": limit,
             "closed": closed,
@@ -109,31 +226,104 @@ class PolymarketClient:
             params["tag_id"] = tag_id
         if start_date_min:
             params["start_date_min"] = start_date_min
-            
-        try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            raw_markets = response.json()
-            
-            print(f"Polymarket: Fetched {len(raw_markets)} raw markets")
-            
-            # Convert to unified format
-            unified_markets = []
-            for raw_market in raw_markets:
-                try:
-                    unified = self._convert_to_unified(raw_market)
-                    if unified:
-                        unified_markets.append(unified)
-                except Exception as e:
-                    print(f"Error converting Polymarket market {raw_market.get('id', 'unknown')}: {e}")
+        return params
+    
+    def _iter_unified(self, raw_markets: List[Dict[str, Any]]) -> Iterator[UnifiedMarket]:
+        """Convert raw Gamma markets to unified format, skipping failures"""
+        # Parse every market's outcomes first so odds for the whole batch are computed in one pass
+        parsed = []
+        for raw_market in raw_markets:
+            try:
+                parsed.append(_parse_outcome_prices(raw_market))
+            except Exception:
+                # Leave it to _convert_to_unified, which reports the error
+                parsed.append(None)
+        odds = iter(calculate_odds_batch([price for outcomes in parsed if outcomes for _, price in outcomes]))
+        
+        for raw_market, outcomes in zip(raw_markets, parsed):
+            outcome_odds = [next(odds) for _ in outcomes] if outcomes else None
+            try:
+                unified = self._convert_to_unified(raw_market, outcomes, outcome_odds)
+                if unified:
+                    yield unified
+            except Exception as e:
+                print(f"Error converting Polymarket market {raw_market.get('id', 'unknown')}: {e}")
+                continue
+    
+    def _cached_unified(self, key: Hashable, raw_markets: List[Dict[str, Any]]) -> Optional[List[UnifiedMarket]]:
+        """Converted markets for key if they were built from this exact payload"""
+        entry = self._unified_cache.get(key)
+        if entry is not None and entry[0] is raw_markets:
+            return list(entry[1])
+        return None
+    
+    def _iter_unified_cached(self, key: Hashable, raw_markets: List[Dict[str, Any]]) -> Iterator[UnifiedMarket]:
+        """
+        _iter_unified, reusing the previous conversion while the response cache
+        still hands back the same payload (fresh hit or 304 revalidation)
+        
+        Reused markets are the same objects handed to earlier callers, so
+        nothing may mutate them.
+        """
+        cached = self._cached_unified(key, raw_markets)
+        if cached is not None:
+            yield from cached
+            return
+        
+        self._record_token_prices(raw_markets)
+        converted = []
+        for unified in self._iter_unified(raw_markets):
+            converted.append(unified)
+            yield unified
+        if key not in self._unified_cache and len(self._unified_cache) >= self._response_cache.maxsize:
+            self._unified_cache.pop(next(iter(self._unified_cache)), None)
+        self._unified_cache[key] = (raw_markets, converted)
+    
+    def _record_token_prices(self, raw_markets: List[Dict[str, Any]]):
+        """Remember each outcome token's listed price for get_prices_bulk_async"""
+        recorded_at = time.monotonic()
+        # Entries past the TTL are never served; drop them so delisted tokens don't accumulate
+        ttl = self._response_cache.ttl
+        self._token_prices = {
+            token_id: entry for token_id, entry in self._token_prices.items() if recorded_at - entry[1] < ttl
+        }
+        for raw_market in raw_markets:
+            try:
+                token_ids = raw_market.get("clobTokenIds")
+                prices = raw_market.get("outcomePrices")
+                token_ids = orjson.loads(token_ids) if isinstance(token_ids, str) else token_ids
+                prices = orjson.loads(prices) if isinstance(prices, str) else prices
+                if not token_ids or not prices or len(token_ids) != len(prices):
                     continue
-            
-            print(f"Polymarket: Converted {len(unified_markets)} markets to unified format")
-            return unified_markets
-            
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching Polymarket markets: {e}")
-            return []
+                for token_id, price in zip(token_ids, prices):
+                    self._token_prices[token_id] = (float(price), recorded_at)
+            except (orjson.JSONDecodeError, ValueError, TypeError):
+                continue
+    
+    async def get_prices_bulk_async(self, token_ids: List[str], side: str = "BUY") -> Dict[str, Optional[float]]:
+        """
+        Prices for many tokens, fetching from the CLOB only what recent listings don't cover
+        
+        Tokens seen in a Gamma /markets response within the response cache TTL
+        use that listing's outcome price (not side-specific). The rest are
+        fetched concurrently with get_market_price_async.
+        
+        Returns:
+            Mapping of token ID -> price (None if the fetch failed)
+        """
+        now = time.monotonic()
+        prices: Dict[str, Optional[float]] = {}
+        missing = []
+        for token_id in token_ids:
+            entry = self._token_prices.get(token_id)
+            if entry is not None and now - entry[1] < self._response_cache.ttl:
+                prices[token_id] = entry[0]
+            else:
+                missing.append(token_id)
+        
+        fetched = await asyncio.gather(*(self.get_market_price_async(token_id, side) for token_id in missing))
+        prices.update(zip(missing, fetched))
+        return prices
     
     def fetch_market_by_id(self, market_id: str) -> Optional[UnifiedMarket]:
         """Fetch a single market by condition ID"""
@@ -141,9 +331,9 @@ class PolymarketClient:
         params = {"condition_ids": market_id}
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = self._session.get(url, params=params, timeout=30)
             response.raise_for_status()
-            raw_markets = response.json()
+            raw_markets = decode_json(response)
             
             if raw_markets and len(raw_markets) > 0:
                 return self._convert_to_unified(raw_markets[0])
@@ -153,35 +343,104 @@ class PolymarketClient:
             print(f"Error fetching Polymarket market {market_id}: {e}")
             return None
     
+    async def fetch_market_by_id_async(self, market_id: str) -> Optional[UnifiedMarket]:
+        """Async variant of fetch_market_by_id using the shared aiohttp session"""
+        url = f"{self.gamma_api_base}/markets"
+        params = {"condition_ids": market_id}
+        
+        try:
+            raw_markets = await self._get_json_async(url, params=params)
+        except AIO_ERRORS as e:
+            print(f"Error fetching Polymarket market {market_id}: {e}")
+            return None
+        
+        if raw_markets:
+            return self._convert_to_unified(raw_markets[0])
+        return None
+    
+    async def fetch_markets_by_ids_async(self, condition_ids: List[str]) -> Dict[str, UnifiedMarket]:
+        """
+        Fetch several markets by condition ID in a single Gamma request
+        
+        Returns:
+            Mapping of condition ID -> UnifiedMarket for the markets found
+        """
+        condition_ids = list(dict.fromkeys(condition_ids))
+        if not condition_ids:
+            return {}
+        url = f"{self.gamma_api_base}/markets"
+        params = {"condition_ids": condition_ids, "limit": len(condition_ids)}
+        
+        try:
+            raw_markets = await self._get_json_async(url, params=params)
+        except AIO_ERRORS as e:
+            print(f"Error fetching {len(condition_ids)} Polymarket markets: {e}")
+            return {}
+        
+        return {market.market_id: market for market in self._iter_unified(raw_markets or [])}
+    
     def get_orderbook(self, token_id: str) -> Optional[Dict[str, Any]]:
         """Get orderbook for a specific token"""
         url = f"{self.clob_api_base}/book"
         params = {"token_id": token_id}
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self._session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            return response.json()
+            return decode_json(response)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching orderbook for token {token_id}: {e}")
             return None
     
+    async def get_orderbook_async(self, token_id: str) -> Optional[Dict[str, Any]]:
+        """Async variant of get_orderbook"""
+        url = f"{self.clob_api_base}/book"
+        params = {"token_id": token_id}
+        
+        try:
+            return await self._get_json_async(url, params=params)
+        except AIO_ERRORS as e:
+            print(f"Error fetching orderbook for token {token_id}: {e}")
+            return None
+    
     def get_market_price(self, token_id: str, side: str = "BUY") -> Optional[float]:
         """Get market price for a specific token"""
         url = f"{self.clob_api_base}/price"
         params = {"token_id": token_id, "side": side}
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self._session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            price_data = response.json()
+            price_data = decode_json(response)
             return float(price_data.get("price", 0))
         except requests.exceptions.RequestException as e:
             print(f"Error fetching price for token {token_id}: {e}")
             return None
     
-    def _convert_to_unified(self, raw_market: Dict[str, Any]) -> Optional[UnifiedMarket]:
-        """Convert Polymarket market to unified format"""
+    async def get_market_price_async(self, token_id: str, side: str = "BUY") -> Optional[float]:
+        """Async variant of get_market_price"""
+        url = f"{self.clob_api_base}/price"
+        params = {"token_id": token_id, "side": side}
+        
+        try:
+            price_data = await self._get_json_async(url, params=params)
+            return float(price_data.get("price", 0))
+        except AIO_ERRORS as e:
+            print(f"Error fetching price for token {token_id}: {e}")
+            return None
+    
+    def _convert_to_unified(
+        self,
+        raw_market: Dict[str, Any],
+        outcomes: Optional[List[Tuple[Any, float]]] = None,
+        outcome_odds: Optional[List[Tuple[float, str]]] = None
+    ) -> Optional[UnifiedMarket]:
+        """
+        Convert Polymarket market to unified format
+        
+        outcomes / outcome_odds may be precomputed for a batch (see _iter_unified);
+        otherwise they are parsed and calculated here.
+        """
         try:
             # Extract basic info
             market_id = raw_market.get("conditionId") or raw_market.get("id")
@@ -191,44 +450,33 @@ class PolymarketClient:
                 return None
             
             # Parse outcomes and prices
-            outcomes_str = raw_market.get("outcomes", "[]")
-            prices_str = raw_market.get("outcomePrices", "[]")
-            
-            try:
-                outcomes = json.loads(outcomes_str) if isinstance(outcomes_str, str) else outcomes_str
-                prices = json.loads(prices_str) if isinstance(prices_str, str) else prices_str
-            except json.JSONDecodeError:
-                return None
-            
-            if not outcomes or not prices or len(outcomes) != len(prices):
+            if outcomes is None:
+                outcomes = _parse_outcome_prices(raw_market)
+            if not outcomes:
                 return None
+            if outcome_odds is None:
+                outcome_odds = [
+                    (calculate_decimal_odds(price), calculate_american_odds(price)) for _, price in outcomes
+                ]
             
             # Create MarketOutcome objects
-            market_outcomes = []
-            for outcome_name, price_str in zip(outcomes, prices):
-                try:
-                    price = float(price_str)
-                    if price <= 0 or price >= 1:
-                        continue
-                    
-                    decimal_odds = calculate_decimal_odds(price)
-                    american_odds = calculate_american_odds(price)
-                    
-                    market_outcomes.append(MarketOutcome(
-                        name=outcome_name,
-                        price=price,
-                        decimal_odds=decimal_odds,
-                        american_odds=american_odds,
-                        volume=None
-                    ))
-                except (ValueError, TypeError):
-                    continue
+            market_outcomes = [
+                MarketOutcome(
+                    name=outcome_name,
+                    price=price,
+                    decimal_odds=decimal_odds,
+                    american_odds=american_odds,
+                    volume=None
+                )
+                for (outcome_name, price), (decimal_odds, american_odds) in zip(outcomes, outcome_odds)
+            ]
             
-            if not market_outcomes:
-                return None
+            category = raw_market.get("category")
+            tags = raw_market.get("tags", [])
+            events = raw_market.get("events", [])
             
             # Determine market type from tags/events
-            market_type = self._determine_market_type(raw_market)
+            market_type = self._determine_market_type(tags, events, category)
             
             # Parse dates
             start_time = None
@@ -237,35 +485,28 @@ class PolymarketClient:
             game_start_time = raw_market.get("gameStartTime")
             if game_start_time:
                 try:
-                    start_time = date_parser.parse(game_start_time)
-                except:
+                    start_time = parse_iso_datetime(game_start_time)
+                except (TypeError, ValueError, OverflowError):
                     pass
             
             end_date = raw_market.get("endDate")
             if end_date:
                 try:
-                    end_time = date_parser.parse(end_date)
-                except:
+                    end_time = parse_iso_datetime(end_date)
+                except (TypeError, ValueError, OverflowError):
                     pass
             
             # Extract category info
-            category = raw_market.get("category")
-            tags = raw_market.get("tags", [])
-            tag_name = tags[0].get("label") if tags and len(tags) > 0 else None
+            tag_name = tags[0].get("label") if tags else None
             
             # Extract events info
-            events = raw_market.get("events", [])
             sport = None
             league = None
-            if events and len(events) > 0:
+            if events:
                 event = events[0]
                 sport = event.get("sportLabel")
                 league = event.get("leagueName")
             
-            # Create normalized title and extract teams
-            normalized_title = normalize_market_title(question)
-            normalized_teams = extract_team_names(question)
-            
             # Create unified market
             unified = UnifiedMarket(
                 platform=Platform.POLYMARKET,
@@ -281,11 +522,10 @@ class PolymarketClient:
                 league=league,
                 total_volume=raw_market.get("volumeNum"),
                 liquidity=raw_market.get("liquidityNum"),
+                spread=raw_market.get("spread") or 0.0,
                 is_active=raw_market.get("active", True),
                 is_closed=raw_market.get("closed", False),
-                raw_data=raw_market,
-                normalized_title=normalized_title,
-                normalized_teams=normalized_teams
+                raw_data=raw_market
             )
             
             return unified
@@ -294,27 +534,30 @@ class PolymarketClient:
             print(f"Error in _convert_to_unified: {e}")
             return None
     
-    def _determine_market_type(self, raw_market: Dict[str, Any]) -> MarketType:
-        """Determine the type of market based on tags and events"""
+    def _determine_market_type(
+        self,
+        tags: Optional[List[Dict[str, Any]]],
+        events: Optional[List[Dict[str, Any]]],
+        category: Optional[str]
+    ) -> MarketType:
+        """Determine the type of market based on tags, events and category"""
         # Check tags
-        tags = raw_market.get("tags", [])
         if tags:
-            tag_labels = [tag.get("label", "").lower() for tag in tags]
-            for label in tag_labels:
-                if any(sport in label for sport in ["nfl", "nba", "mlb", "nhl", "soccer", "football", "basketball", "tennis", "ufc", "mma"]):
+            for tag in tags:
+                label = tag.get("label", "").lower()
+                if _SPORTS_TAG_PATTERN.search(label):
                     return MarketType.SPORTS
-                if "politics" in label or "election" in label:
+                if _POLITICS_TAG_PATTERN.search(label):
                     return MarketType.POLITICS
-                if "crypto" in label or "bitcoin" in label or "ethereum" in label:
+                if _CRYPTO_TAG_PATTERN.search(label):
                     return MarketType.CRYPTO
         
         # Check events
-        events = raw_market.get("events", [])
-        if events and len(events) > 0:
+        if events:
             return MarketType.SPORTS
         
         # Check category
-        category = raw_market.get("category", "").lower()
+        category = (category or "").lower()
         if "sports" in category:
             return MarketType.SPORTS
         if "politics" in category:
@@ -326,7 +569,7 @@ class PolymarketClient:
 
 
 if __name__ == "__main__":
-    # Test the client
+    # Test the client (run from the service directory: python -m api_clients.polymarket_client)
     client = PolymarketClient()
     markets = client.fetch_markets(limit=10, active=True)
     
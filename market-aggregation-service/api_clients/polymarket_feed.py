@@ -0,0 +1,223 @@
+"""
+Live Polymarket order books from the CLOB market WebSocket channel
+"""
+import asyncio
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import aiohttp
+import orjson
+
+from api_clients.http_session import DEFAULT_HEADERS
+
+POLYMARKET_MARKET_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+
+# The server drops clients that don't PING about every 10 seconds
+FEED_PING_INTERVAL_SECONDS = 10
+# No message (PONGs included) for this long means the connection is dead
+FEED_STALE_SECONDS = 30
+FEED_RECONNECT_MAX_DELAY_SECONDS = 30
+# A connection must deliver snapshots and stay up this long to reconnect without backoff
+FEED_HEALTHY_CONNECTION_SECONDS = 60
+# Polymarket shows the last trade instead of the midpoint when the spread is wider than this
+MIDPOINT_MAX_SPREAD = 0.10
+
+
+def _levels(entries) -> Dict[float, float]:
+    """price -> size for a book side given as [{"price": "0.48", "size": "30"}, ...]"""
+    levels = {}
+    if not isinstance(entries, list):
+        return levels
+    for entry in entries:
+        try:
+            size = float(entry["size"])
+            if size > 0:
+                levels[float(entry["price"])] = size
+        except (KeyError, TypeError, ValueError):
+            continue
+    return levels
+
+
+class PolymarketOrderBookFeed:
+    """
+    Local order books for tracked outcome tokens, kept current by the market WebSocket
+
+    Each book starts from the "book" snapshot the server sends on subscribe and
+    is updated in place by "price_change" events. The channel carries no
+    sequence numbers, so a gap can't be detected and patched: any disconnect,
+    or silence past FEED_STALE_SECONDS, discards every book. Until the
+    reconnect's snapshots arrive, lookups return None and callers use REST prices.
+    """
+
+    def __init__(self, url: str = POLYMARKET_MARKET_WS_URL):
+        self.url = url
+        self._asset_ids: Set[str] = set()
+        # asset id -> (bids, asks), each price -> size
+        self._books: Dict[str, Tuple[Dict[float, float], Dict[float, float]]] = {}
+        self._last_message_at = 0.0
+        self._subscriptions_changed: Optional[asyncio.Event] = None
+        # Set when _keepalive closes the socket to pick up new subscriptions
+        self._resubscribing = False
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def track(self, asset_ids: Iterable[str]):
+        """Subscribe to more outcome tokens (the feed reconnects to pick them up)"""
+        new_ids = {asset_id for asset_id in asset_ids if asset_id} - self._asset_ids
+        if new_ids:
+            self._asset_ids |= new_ids
+            if self._subscriptions_changed is not None:
+                self._subscriptions_changed.set()
+
+    def best_prices(self, asset_id: Optional[str]) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        """(best bid, best ask) from the live book, or None if there is no current book for the token"""
+        if time.monotonic() - self._last_message_at > FEED_STALE_SECONDS:
+            return None
+        book = self._books.get(asset_id)
+        if book is None:
+            return None
+        bids, asks = book
+        return (max(bids) if bids else None, min(asks) if asks else None)
+
+    def midpoint(self, asset_id: Optional[str]) -> Optional[float]:
+        """
+        Live price the way Polymarket displays it: the bid/ask midpoint
+
+        None when there is no current book, a side is empty, or the spread is
+        too wide for the midpoint to be the displayed price.
+        """
+        prices = self.best_prices(asset_id)
+        if prices is None:
+            return None
+        bid, ask = prices
+        if bid is None or ask is None or ask - bid > MIDPOINT_MAX_SPREAD:
+            return None
+        return (bid + ask) / 2
+
+    def start(self):
+        """Run the feed on the current event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def aclose(self):
+        """Stop the feed and close its session"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._books.clear()
+
+    async def _run(self):
+        self._subscriptions_changed = asyncio.Event()
+        if self._asset_ids:
+            self._subscriptions_changed.set()
+        failures = 0
+        while True:
+            # Nothing to subscribe to until an endpoint tracks a market
+            await self._subscriptions_changed.wait()
+            self._subscriptions_changed.clear()
+            self._resubscribing = False
+            connected_at = time.monotonic()
+            try:
+                await self._listen()
+            except Exception as e:
+                # Any error, not just network ones: this task is the feed's only runner
+                print(f"Polymarket feed disconnected: {e}")
+            # Back off unless we closed to resubscribe or the connection delivered
+            # snapshots and stayed up, so a server that accepts and immediately
+            # closes (rejected subscription, maintenance) isn't hammered in a loop
+            healthy = self._resubscribing or (
+                bool(self._books) and time.monotonic() - connected_at >= FEED_HEALTHY_CONNECTION_SECONDS
+            )
+            self._books.clear()
+            failures = 0 if healthy else failures + 1
+            if failures:
+                await asyncio.sleep(min(FEED_RECONNECT_MAX_DELAY_SECONDS, 2 ** failures))
+            # Reconnect straight away with the current subscription set
+            self._subscriptions_changed.set()
+
+    async def _listen(self):
+        """One connection: subscribe, then apply events until the socket closes"""
+        if self._session is None or self._session.closed:
+            # No total timeout: it would cut off a long-lived socket
+            self._session = aiohttp.ClientSession(
+                headers={"User-Agent": DEFAULT_HEADERS["User-Agent"]},
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=10),
+            )
+        async with self._session.ws_connect(self.url) as ws:
+            await ws.send_str(orjson.dumps({"type": "market", "assets_ids": sorted(self._asset_ids)}).decode())
+            self._last_message_at = time.monotonic()
+            keepalive = asyncio.create_task(self._keepalive(ws))
+            try:
+                async for message in ws:
+                    if message.type != aiohttp.WSMsgType.TEXT:
+                        continue
+                    self._last_message_at = time.monotonic()
+                    if message.data == "PONG":
+                        continue
+                    try:
+                        payload = orjson.loads(message.data)
+                    except orjson.JSONDecodeError:
+                        continue
+                    for event in payload if isinstance(payload, list) else (payload,):
+                        self._apply(event)
+            finally:
+                keepalive.cancel()
+
+    async def _keepalive(self, ws: aiohttp.ClientWebSocketResponse):
+        """PING periodically; close the socket if it goes silent or the subscription set grows"""
+        while not ws.closed:
+            try:
+                await asyncio.wait_for(self._subscriptions_changed.wait(), FEED_PING_INTERVAL_SECONDS)
+                # Closing ends _listen; _run reconnects with every tracked token
+                self._resubscribing = True
+                await ws.close()
+                return
+            except asyncio.TimeoutError:
+                pass
+            if time.monotonic() - self._last_message_at > FEED_STALE_SECONDS:
+                await ws.close()
+                return
+            await ws.send_str("PING")
+
+    def _apply(self, event: Dict):
+        # Anything malformed is skipped rather than raised, so one bad message can't drop the connection
+        if not isinstance(event, dict):
+            return
+        event_type = event.get("event_type")
+        if event_type == "book":
+            self._books[event.get("asset_id")] = (
+                _levels(event.get("bids") or event.get("buys")),
+                _levels(event.get("asks") or event.get("sells")),
+            )
+        elif event_type == "price_change":
+            # Current messages list changes with their asset; older ones put asset_id on the event
+            changes = event.get("price_changes")
+            if changes is None:
+                legacy_changes = event.get("changes")
+                if not isinstance(legacy_changes, list):
+                    return
+                changes = [
+                    {**change, "asset_id": event.get("asset_id")} for change in legacy_changes if isinstance(change, dict)
+                ]
+            if not isinstance(changes, list):
+                return
+            for change in changes:
+                if not isinstance(change, dict):
+                    continue
+                book = self._books.get(change.get("asset_id"))
+                if book is None:
+                    # No snapshot yet for this token
+                    continue
+                try:
+                    price, size = float(change["price"]), float(change["size"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                levels = book[0] if change.get("side") == "BUY" else book[1]
+                if size > 0:
+                    levels[price] = size
+                else:
+                    levels.pop(price, None)
@@ -1,21 +1,42 @@
+import asyncio
 import os
 import requests
 from datetime import date
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
-class RundownClient:
+from api_clients.http_session import AIO_ERRORS, AsyncSessionMixin, ResponseCache, create_session, get_json_cached
+
+# Max concurrent requests in one get_events_batch call (RapidAPI plans are tightly rate limited)
+RUNDOWN_BATCH_CONCURRENCY = 10
+
+RUNDOWN_API_HOST = "therundown-therundown-v1.p.rapidapi.com"
+
+class RundownClient(AsyncSessionMixin):
     """
     Client for The Rundown API.
     Requires RAPIDAPI_KEY environment variable to be set.
     """
-    def __init__(self):
-        self.api_key = "bc27e7387dmsh38d411a3abc9e35plea17cjsnccd1838ac7b7"
-        self.api_host = "therundown-therundown-v1.p.rapidapi.com"
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key or os.getenv("RAPIDAPI_KEY")
+        self.api_host = RUNDOWN_API_HOST
         self.api_base = f"https://{self.api_host}"
         self.headers = {
             "x-rapidapi-key": self.api_key,
             "x-rapidapi-host": self.api_host,
         }
+        self._session = create_session(self.headers)
+        self._aio_headers = self.headers
+        self._response_cache = ResponseCache()
+
+    def close(self):
+        """Close the underlying HTTP session"""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def get_events_by_date(self, sport_id: int, event_date: date) -> Dict[str, Any]:
         """Fetch events for a given sport and date."""
@@ -23,17 +44,57 @@ class RundownClient:
             print("Warning: RAPIDAPI_KEY environment variable not set. RundownClient will not work.")
             return {"events": []}
             
-        date_str = event_date.strftime("%Y-%m-%d")
-        url = f"{self.api_base}/sports/{sport_id}/events/{date_str}"
-        params = {"include": "scores"}
+        url, params = self._events_request(sport_id, event_date)
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
-            response.raise_for_status()
             # The API returns a dictionary with an 'events' key which is a list of event objects.
-            return response.json()
+            return get_json_cached(self._session, self._response_cache, url, params)
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching The Rundown events: {e}")
-            if "403" in str(e) or "not subscribed" in str(e).lower():
-                print("API key not subscribed to The Rundown API. Please subscribe on RapidAPI.")
+            self._report_error(e)
+            return {"events": []}
+
+    async def get_events_by_date_async(self, sport_id: int, event_date: date) -> Dict[str, Any]:
+        """Async variant of get_events_by_date using the shared aiohttp session"""
+        if not self.api_key:
+            print("Warning: RAPIDAPI_KEY environment variable not set. RundownClient will not work.")
             return {"events": []}
+
+        url, params = self._events_request(sport_id, event_date)
+
+        try:
+            return await self._get_json_async(url, params=params, cache=self._response_cache)
+        except AIO_ERRORS as e:
+            self._report_error(e)
+            return {"events": []}
+
+    async def get_events_batch(self, pairs: List[Tuple[int, date]]) -> Dict[Tuple[int, date], Dict[str, Any]]:
+        """
+        Fetch events for several (sport_id, event_date) pairs concurrently
+        
+        At most RUNDOWN_BATCH_CONCURRENCY requests are in flight at once. A
+        failed pair maps to {"events": []} like get_events_by_date_async, so
+        one failure doesn't affect the others.
+        
+        Returns:
+            Mapping of (sport_id, event_date) -> events response
+        """
+        semaphore = asyncio.Semaphore(RUNDOWN_BATCH_CONCURRENCY)
+
+        async def fetch_one(sport_id: int, event_date: date) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_events_by_date_async(sport_id, event_date)
+
+        results = await asyncio.gather(*(fetch_one(sport_id, event_date) for sport_id, event_date in pairs))
+        return dict(zip(pairs, results))
+
+    def _events_request(self, sport_id: int, event_date: date) -> Tuple[str, Dict[str, Any]]:
+        """URL and query params for a sport's events on a date"""
+        date_str = event_date.strftime("%Y-%m-%d")
+        url = f"{self.api_base}/sports/{sport_id}/events/{date_str}"
+        return url, {"include": "scores"}
+
+    @staticmethod
+    def _report_error(e: Exception):
+        print(f"Error fetching The Rundown events: {e}")
+        if "403" in str(e) or "not subscribed" in str(e).lower():
+            print("API key not subscribed to The Rundown API. Please subscribe on RapidAPI.")
@@ -10,28 +10,39 @@ Provides real-time market comparison data from multiple platforms:
 from fastapi import FastAPI, HTTPException
 from fastapi import Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers
 from datetime import datetime, timedelta, timezone, date
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Hashable, Tuple
+import dataclasses
+import functools
+import gzip
+import hashlib
+import numpy as np
 import signal
 import asyncio
 import sys
 import os
-import requests
+import threading
 import time
-from dateutil import parser as date_parser
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from api_clients.polymarket_client import PolymarketClient
+from api_clients.polymarket_client import PolymarketClient, outcome_token_ids
+from api_clients.polymarket_feed import PolymarketOrderBookFeed
 from api_clients.kalshi_client import KalshiClient
 from api_clients.limitless_client import LimitlessClient
 from api_clients.odds_api_client import OddsAPIClient
 from api_clients.rundown_client import RundownClient
+from api_clients.matches_client import MatchesClient
+from api_clients.http_session import AIO_ERRORS, FlightCancelledError, ResponseTooLargeError
 from aggregator import MarketAggregator
+from models import calculate_american_odds, calculate_decimal_odds, index_outcomes, parse_iso_datetime
 from market_mappings import MANUAL_MAPPINGS
 from nfl_teams import normalize_nfl_team_name
 
-app = FastAPI(title="Market Aggregator API", version="1.0.0")
+app = FastAPI(title="Market Aggregator API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # CORS middleware for Next.js dashboard
 app.add_middleware(
@@ -42,61 +53,373 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Responses smaller than this aren't worth compressing
+GZIP_MINIMUM_SIZE = 1024
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
 # Initialize clients
 poly_client = PolymarketClient()
 kalshi_client = KalshiClient()
 limitless_client = LimitlessClient()
 rundown_client = RundownClient()
-odds_api_key = "db06be1d18367c369444aa40d6a25499"
-odds_client = OddsAPIClient(odds_api_key)
+odds_client = OddsAPIClient()
+matches_client = MatchesClient()
+# Live Polymarket books for the mapped /politics and /crypto markets
+poly_feed = PolymarketOrderBookFeed()
+
+
+# Cache-warming tasks started with the app
+_background_tasks: List[asyncio.Task] = []
+
+
+@app.on_event("startup")
+async def start_background_refresh():
+    """Keep the default /others and /rundown pages warm so requests don't wait on the upstreams"""
+    poly_feed.start()
+    _background_tasks.append(asyncio.create_task(
+        refresh_loop(get_others_matched_markets, OTHERS_PREFETCH_PARAMS, OTHERS_REFRESH_INTERVAL_SECONDS)
+    ))
+    _background_tasks.append(asyncio.create_task(
+        refresh_loop(
+            get_rundown_markets, RUNDOWN_PREFETCH_PARAMS, RUNDOWN_REFRESH_INTERVAL_SECONDS,
+            idle_after=RUNDOWN_IDLE_AFTER_SECONDS
+        )
+    ))
+
+
+@app.on_event("shutdown")
+async def close_clients():
+    """Stop background refreshes and close the clients' aiohttp sessions"""
+    for task in _background_tasks:
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    _background_tasks.clear()
+    await poly_feed.aclose()
+    for client in (poly_client, kalshi_client, limitless_client, rundown_client, odds_client, matches_client):
+        await client.aclose()
 
-# Simple in-memory cache for external "others" endpoint
+# Response cache TTLs for the comparison endpoints
+NFL_CRYPTO_CACHE_TTL_SECONDS = 5
+POLITICS_CACHE_TTL_SECONDS = 30
+CRYPTO_CACHE_TTL_SECONDS = 5
 OTHERS_CACHE_TTL_SECONDS = 5
-_others_cache_payload: Optional[Dict[str, Any]] = None
-_others_cache_limit: Optional[int] = None
-_others_cache_offset: Optional[int] = None
-_others_cache_ts: float = 0.0
-_others_cache_lock = asyncio.Lock()
-
-def filter_future_markets(markets):
-    """Filter markets by future gameStartTime and spread <= 0.05"""
-    if not markets:
-        return []
+# The /others page the dashboard loads, refreshed in the background a little
+# more often than its TTL so the cached entry never lapses
+OTHERS_PREFETCH_PARAMS = {"limit": 10, "offset": 0}
+OTHERS_REFRESH_INTERVAL_SECONDS = 4
+# Same for today's NFL /rundown, but only while clients are polling it: every
+# refresh spends RapidAPI quota
+RUNDOWN_CACHE_TTL_SECONDS = 10
+RUNDOWN_PREFETCH_PARAMS = {"date_param": None, "sport_id": 2}
+RUNDOWN_REFRESH_INTERVAL_SECONDS = 8
+RUNDOWN_IDLE_AFTER_SECONDS = 120
+# Bounds the entries paged endpoints like /others can hold at once
+ENDPOINT_CACHE_MAXSIZE = 64
+# Distinct price strings /others keeps parsed; upstream prices repeat across markets and refreshes
+FRACTION_CACHE_MAXSIZE = 4096
+
+class PrecompressedJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse that also keeps a gzipped copy of its body
     
-    future_markets = []
-    now = datetime.now(timezone.utc) - timedelta(hours=2)
+    Cached responses are served many times per build, so compressing once here
+    spares GZipMiddleware from recompressing on every hit (it passes responses
+    that already set Content-Encoding through untouched).
     
-    for market in markets:
-        game_start_time_str = market.raw_data.get("gameStartTime")
-        spread = market.raw_data.get('spread', 0.0)
+    It also carries a weak ETag over everything but the payload's build
+    "timestamp". The dashboard polls on a timer, and a poll whose
+    If-None-Match still matches gets a bodiless 304, even across rebuilds,
+    as long as the data itself hasn't changed.
+    """
+    
+    def __init__(self, content: Any):
+        super().__init__(content)
+        self.gzip_body = None
+        if len(self.body) >= GZIP_MINIMUM_SIZE:
+            self.gzip_body = gzip.compress(self.body)
+            self.headers["vary"] = "Accept-Encoding"
+        versioned = self.body
+        if isinstance(content, dict) and "timestamp" in content:
+            versioned = self.render({key: value for key, value in content.items() if key != "timestamp"})
+        self.etag = f'W/"{hashlib.blake2b(versioned, digest_size=16).hexdigest()}"'
+        self.headers["etag"] = self.etag
+    
+    async def __call__(self, scope, receive, send):
+        # Always send a copy of the headers: the instance is reused across requests
+        # and middlewares (CORS, GZip) edit the start message's headers in place
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match and self._etag_matches(if_none_match):
+            headers = [(name, value) for name, value in self.raw_headers if name in (b"etag", b"vary")]
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        headers = list(self.raw_headers)
+        body = self.body
+        if self.gzip_body is not None and "gzip" in request_headers.get("accept-encoding", ""):
+            headers = [(name, value) for name, value in headers if name != b"content-length"]
+            headers += [
+                (b"content-length", str(len(self.gzip_body)).encode("latin-1")),
+                (b"content-encoding", b"gzip"),
+            ]
+            body = self.gzip_body
+        await send({"type": "http.response.start", "status": self.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+    
+    def _etag_matches(self, if_none_match: str) -> bool:
+        """Weak comparison against an If-None-Match list, as conditional GETs use"""
+        if if_none_match.strip() == "*":
+            return True
+        own = self.etag[2:]
+        return any(tag.strip().removeprefix("W/") == own for tag in if_none_match.split(","))
+
+
+# (endpoint, query params) -> (expires_at, response), and the builds currently in flight
+_endpoint_cache: Dict[Hashable, Tuple[float, PrecompressedJSONResponse]] = {}
+_endpoint_inflight: Dict[Hashable, asyncio.Future] = {}
+
+
+def cached_endpoint(ttl: float):
+    """
+    Cache an async endpoint's rendered JSON response for ttl seconds per set of query params
+    
+    The payload is serialized (and gzipped) once per build, so cache hits skip encoding entirely.
+    Entries are pruned once expired and evicted oldest first beyond
+    ENDPOINT_CACHE_MAXSIZE. Concurrent requests that miss the cache share one
+    in-flight build instead of each hitting the upstream APIs. Errors are
+    passed to every waiter and never cached. wrapper.refresh(**kwargs)
+    rebuilds an entry regardless of freshness, for background warming, and
+    wrapper.seconds_since_request(**kwargs) reports how recently it was asked for.
+    """
+    def decorator(func):
+        # Keys polled by seconds_since_request -> time.monotonic() of their last request
+        watched: Dict[Hashable, float] = {}
         
-        if spread <= 0.05 and game_start_time_str:
+        def cache_key(kwargs) -> Hashable:
+            return (func.__name__, tuple(sorted(kwargs.items())))
+        
+        def store(key: Hashable, response: PrecompressedJSONResponse):
+            now = time.monotonic()
+            # Drop expired entries so one-off query params don't accumulate
+            for stale in [k for k, (expires_at, _) in _endpoint_cache.items() if expires_at <= now]:
+                del _endpoint_cache[stale]
+            if key not in _endpoint_cache and len(_endpoint_cache) >= ENDPOINT_CACHE_MAXSIZE:
+                _endpoint_cache.pop(next(iter(_endpoint_cache)))
+            _endpoint_cache[key] = (now + ttl, response)
+        
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            key = cache_key(kwargs)
+            if key in watched:
+                watched[key] = time.monotonic()
+            entry = _endpoint_cache.get(key)
+            if entry is not None and time.monotonic() < entry[0]:
+                return entry[1]
+            
+            while (pending := _endpoint_inflight.get(key)) is not None:
+                try:
+                    return await asyncio.shield(pending)
+                except FlightCancelledError:
+                    # The request we joined was cancelled, not us: rejoin or lead the retry
+                    continue
+            
+            future = asyncio.get_running_loop().create_future()
+            _endpoint_inflight[key] = future
             try:
-                game_start_time = date_parser.parse(game_start_time_str)
-                if game_start_time.tzinfo is None:
-                    game_start_time = game_start_time.replace(tzinfo=timezone.utc)
-                
-                if game_start_time > now:
-                    future_markets.append(market)
-            except Exception:
-                continue
+                response = PrecompressedJSONResponse(await func(**kwargs))
+            except asyncio.CancelledError:
+                # Cancelling the future would cancel waiters too; let them retry instead
+                future.set_exception(FlightCancelledError())
+                future.exception()
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                # Mark retrieved so an unawaited failure isn't logged by asyncio
+                future.exception()
+                raise
+            else:
+                store(key, response)
+                future.set_result(response)
+                return response
+            finally:
+                del _endpoint_inflight[key]
+        
+        async def refresh(**kwargs):
+            store(cache_key(kwargs), PrecompressedJSONResponse(await func(**kwargs)))
+        
+        def seconds_since_request(**kwargs) -> float:
+            """Seconds since a request last asked for kwargs (inf until one does after the first call)"""
+            return time.monotonic() - watched.setdefault(cache_key(kwargs), float("-inf"))
+        
+        wrapper.refresh = refresh
+        wrapper.seconds_since_request = seconds_since_request
+        return wrapper
+    return decorator
+
+
+async def refresh_loop(endpoint, params: Dict[str, Any], interval: float, idle_after: Optional[float] = None):
+    """
+    Rebuild a cached_endpoint's response for params every interval seconds
+    
+    With idle_after, refreshes pause while no request has asked for params in
+    that many seconds. Failures are logged; requests fall back to building the
+    response on demand until the next refresh succeeds.
+    """
+    while True:
+        if idle_after is None or endpoint.seconds_since_request(**params) < idle_after:
+            try:
+                await endpoint.refresh(**params)
+            except Exception as e:
+                print(f"Error refreshing {endpoint.__name__} cache: {e}")
+        await asyncio.sleep(interval)
+
+
+# Max concurrent per-mapping lookups in /politics and /crypto
+MAPPING_FETCH_CONCURRENCY = 16
+
+
+async def _none():
+    """Awaitable placeholder for a platform with no mapped ID"""
+    return None
+
+
+async def _gather_bounded(aws, limit: int = MAPPING_FETCH_CONCURRENCY) -> List[Any]:
+    """asyncio.gather with at most limit awaitables running at once; exceptions are returned, not raised"""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=True)
+
+
+def _first_present(d: Dict[str, Any], *keys: str) -> Any:
+    """d[key] for the first key present (even if its value is None), like nested d.get defaults but lazy"""
+    for key in keys:
+        if key in d:
+            return d[key]
+    return None
+
+
+def _parse_fraction(val) -> Optional[float]:
+    try:
+        if val is None:
+            return None
+        n = float(val)
+        if n > 1:
+            n = max(0.0, min(1.0, n / 100.0))
+        else:
+            n = max(0.0, min(1.0, n))
+        return n
+    except Exception:
+        return None
+
+
+_parse_fraction_cached = functools.lru_cache(maxsize=FRACTION_CACHE_MAXSIZE)(_parse_fraction)
+
+
+def to_fraction(val) -> Optional[float]:
+    """
+    A matches-API price as a 0-1 fraction (values over 1 are cents), or None if unparseable
+
+    String prices are memoized; numbers are cheaper to convert than to look up.
+    """
+    if isinstance(val, str):
+        return _parse_fraction_cached(val)
+    return _parse_fraction(val)
+
+
+def with_live_prices(market):
+    """
+    A Polymarket market with outcome prices from the live order book feed
+
+    Subscribes the market's tokens to poly_feed. Outcomes without a usable
+    live midpoint (feed not connected yet, stale, or spread too wide) keep
+    their REST price; the market is returned unchanged if none have one.
+    """
+    token_ids = outcome_token_ids(market.raw_data)
+    poly_feed.track(token_ids.values())
+    outcomes = []
+    for outcome in market.outcomes:
+        price = poly_feed.midpoint(token_ids.get(outcome.name))
+        if price is None or not 0 < price < 1:
+            outcomes.append(outcome)
+            continue
+        outcomes.append(dataclasses.replace(
+            outcome,
+            price=price,
+            decimal_odds=calculate_decimal_odds(price),
+            american_odds=calculate_american_odds(price),
+        ))
+    if all(new is old for new, old in zip(outcomes, market.outcomes)):
+        return market
+    return dataclasses.replace(market, outcomes=outcomes)
+
+
+# /nfl/crypto per-team price candidates, in tie-break order: (platform, source)
+PER_TEAM_SOURCES = (
+    ('polymarket', 'polymarket_team'),
+    ('kalshi', 'kalshi_yes'),
+    ('kalshi', 'opponent_no'),
+)
+
+
+def fill_per_team_best(rows):
+    """
+    Pick the cheapest candidate for every team row in one vectorized pass
+    
+    Each row is (per_team_best list, team_normalized, team_display, candidates),
+    where candidates[i] is (price, american_odds) for PER_TEAM_SOURCES[i] or None.
+    The winning entry is appended to the row's list; rows without candidates are skipped.
+    """
+    rows = [row for row in rows if any(candidate is not None for candidate in row[3])]
+    if not rows:
+        return
     
-    return future_markets
+    # Structure of arrays: one price column per source, NaN where a source is missing
+    prices = np.array(
+        [[candidate[0] if candidate is not None else np.nan for candidate in row[3]] for row in rows],
+        dtype=np.float64
+    )
+    best_idx = np.nanargmin(prices, axis=1).tolist()
+    
+    for (per_team_best, team_norm, team_display, candidates), idx in zip(rows, best_idx):
+        platform, source = PER_TEAM_SOURCES[idx]
+        price, american_odds = candidates[idx]
+        per_team_best.append({
+            'team_normalized': team_norm,
+            'team_display': team_display,
+            'best_platform': platform,
+            'best_source': source,
+            'best_price': price,
+            'best_american_odds': american_odds
+        })
 
 
-def filter_correct_markets(markets):
-    """Filter to only include markets with exactly 2 outcomes"""
-    correct_markets = []
+def filter_game_markets(markets):
+    """Filter to binary (2-outcome) markets with spread <= 0.05 and a future gameStartTime"""
+    if not markets:
+        return []
+    
+    game_markets = []
+    now = datetime.now(timezone.utc) - timedelta(hours=2)
     
     for market in markets:
-        try:
-            outcomes = market.outcomes
-            if len(outcomes) == 2:
-                correct_markets.append(market)
-        except Exception:
+        if len(market.outcomes) != 2 or market.spread > 0.05:
             continue
+        
+        # start_time is gameStartTime, already parsed by the Polymarket client
+        game_start_time = market.start_time
+        if game_start_time is None:
+            continue
+        if game_start_time.tzinfo is None:
+            game_start_time = game_start_time.replace(tzinfo=timezone.utc)
+        
+        if game_start_time > now:
+            game_markets.append(market)
     
-    return correct_markets
+    return game_markets
 """WebSocket support removed; frontend polls REST endpoints."""
 
 
@@ -118,6 +441,7 @@ async def root():
 
 
 @app.get("/nfl/crypto")
+@cached_endpoint(NFL_CRYPTO_CACHE_TTL_SECONDS)
 async def get_nfl_crypto_markets():
     """
     Get NFL market comparisons from Polymarket and Kalshi
@@ -125,33 +449,33 @@ async def get_nfl_crypto_markets():
     try:
         all_markets = []
         
-        # Fetch from Polymarket
+        # Fetch from Polymarket and Kalshi concurrently
         nfl_date = "2025-08-07T00:00:00Z"
-        polymarket_markets = poly_client.fetch_markets(
-            limit=1000,
-            closed=False,
-            active=True,
-            tag_id=450,
-            start_date_min=nfl_date
+        polymarket_markets, kalshi_markets = await asyncio.gather(
+            poly_client.fetch_markets_async(
+                limit=1000,
+                closed=False,
+                active=True,
+                tag_id=450,
+                start_date_min=nfl_date
+            ),
+            kalshi_client.fetch_markets_async(
+                series_ticker="KXNFLGAME",
+                status="open",
+                limit=200
+            )
         )
         
         # Apply filtering
-        future_markets = filter_future_markets(polymarket_markets)
-        game_markets = filter_correct_markets(future_markets)
+        game_markets = filter_game_markets(polymarket_markets)
         all_markets.extend(game_markets)
-        
-        # Fetch from Kalshi
-        kalshi_markets = kalshi_client.fetch_markets(
-            series_ticker="KXNFLGAME",
-            status="open",
-            limit=200
-        )
         all_markets.extend(kalshi_markets)
         
         # Match markets
-        aggregator = MarketAggregator()
+        aggregator = MarketAggregator(polymarket_client=poly_client, kalshi_client=kalshi_client)
         aggregator.all_markets = all_markets
-        matched_groups = aggregator.match_markets()
+        # Matching and comparison building are pure CPU; keep them off the event loop
+        matched_groups = await asyncio.to_thread(aggregator.match_markets)
         
         if not matched_groups:
             return {
@@ -164,10 +488,13 @@ async def get_nfl_crypto_markets():
             }
         
         # Create comparisons
-        comparisons = aggregator.create_comparisons()
+        comparisons = await asyncio.to_thread(aggregator.create_comparisons)
         
         # Format response
         comparison_data = []
+        arbitrage_count = 0
+        # Per-team candidate rows for every comparison, resolved together by fill_per_team_best
+        team_rows = []
         for comp in comparisons:
             poly_market = None
             kalshi_markets_list = []
@@ -178,6 +505,13 @@ async def get_nfl_crypto_markets():
                 elif market.platform.value == 'kalshi':
                     kalshi_markets_list.append(market)
             
+            # Normalize team names once per comparison
+            poly_norm = {o.name: normalize_nfl_team_name(o.name) for o in poly_market.outcomes} if poly_market else {}
+            kalshi_norm = {
+                km.market_id: normalize_nfl_team_name(km.yes_sub_title)
+                for km in kalshi_markets_list
+            }
+            
             # Find best Kalshi market match
             best_kalshi_market = None
             if poly_market and kalshi_markets_list:
@@ -186,12 +520,10 @@ async def get_nfl_crypto_markets():
                 else:
                     poly_outcomes = {o.name: o.price for o in poly_market.outcomes}
                     favorite_team = max(poly_outcomes.items(), key=lambda x: x[1])[0]
-                    normalized_favorite = normalize_nfl_team_name(favorite_team)
+                    normalized_favorite = poly_norm[favorite_team]
                     
                     for kalshi_market in kalshi_markets_list:
-                        kalshi_team = kalshi_market.raw_data.get('yes_sub_title', '')
-                        normalized_kalshi_team = normalize_nfl_team_name(kalshi_team)
-                        if normalized_kalshi_team == normalized_favorite:
+                        if kalshi_norm[kalshi_market.market_id] == normalized_favorite:
                             best_kalshi_market = kalshi_market
                             break
                     
@@ -201,14 +533,13 @@ async def get_nfl_crypto_markets():
             # Calculate specific spread
             specific_spread = comp.price_spread
             if poly_market and best_kalshi_market:
-                kalshi_yes_price = next((o.price for o in best_kalshi_market.outcomes if 'yes' in o.name.lower()), None)
-                kalshi_team_raw = best_kalshi_market.raw_data.get('yes_sub_title', '')
-                normalized_kalshi_team = normalize_nfl_team_name(kalshi_team_raw)
+                kalshi_yes = index_outcomes(best_kalshi_market).get('yes')
+                kalshi_yes_price = kalshi_yes.price if kalshi_yes else None
+                normalized_kalshi_team = kalshi_norm[best_kalshi_market.market_id]
                 
                 poly_team_price = None
                 for outcome in poly_market.outcomes:
-                    normalized_outcome = normalize_nfl_team_name(outcome.name)
-                    if normalized_outcome == normalized_kalshi_team:
+                    if poly_norm[outcome.name] == normalized_kalshi_team:
                         poly_team_price = outcome.price
                         break
                 
@@ -226,16 +557,21 @@ async def get_nfl_crypto_markets():
                 # Map normalized team name -> kalshi market
                 norm_to_kalshi = {}
                 for km in kalshi_markets_list:
-                    team_raw = km.raw_data.get('yes_sub_title', '') or km.raw_data.get('subtitle', '')
-                    norm = normalize_nfl_team_name(team_raw)
+                    if km.yes_sub_title:
+                        norm = kalshi_norm[km.market_id]
+                    else:
+                        norm = normalize_nfl_team_name(km.subtitle)
                     if norm:
                         norm_to_kalshi[norm] = km
                 
+                # Normalized team -> Polymarket display name (first outcome wins)
+                norm_to_display = {}
+                for t in team_names:
+                    norm_to_display.setdefault(poly_norm[t], t)
+                
                 # Try to return exactly two entries in the same order as Polymarket teams when available
-                ordered_norms = []
                 if team_names:
-                    for t in team_names:
-                        ordered_norms.append(normalize_nfl_team_name(t))
+                    ordered_norms = [poly_norm[t] for t in team_names]
                 else:
                     ordered_norms = list(norm_to_kalshi.keys())[:2]
                 
@@ -243,23 +579,17 @@ async def get_nfl_crypto_markets():
                     km = norm_to_kalshi.get(norm)
                     if not km:
                         continue
-                    yes_out = next(({
-                        'name': o.name,
-                        'price': o.price,
-                        'american_odds': o.american_odds
-                    } for o in km.outcomes if 'yes' in o.name.lower()), None)
-                    no_out = next(({
-                        'name': o.name,
-                        'price': o.price,
-                        'american_odds': o.american_odds
-                    } for o in km.outcomes if 'no' in o.name.lower()), None)
+                    kalshi_idx = index_outcomes(km)
+                    yes_out, no_out = (
+                        o.to_price_dict() if o else None for o in (kalshi_idx.get('yes'), kalshi_idx.get('no'))
+                    )
                     kalshi_by_team.append({
                         'team_normalized': norm,
-                        'team_display': next((t for t in team_names if normalize_nfl_team_name(t) == norm), km.raw_data.get('yes_sub_title', '')),
+                        'team_display': norm_to_display.get(norm, km.yes_sub_title),
                         'market_id': km.market_id,
                         'volume': km.total_volume,
                         'liquidity': km.liquidity,
-                        'start_time': km.start_time.isoformat() if km.start_time else None,
+                        'start_time': km.start_time if km.start_time else None,
                         'yes': yes_out,
                         'no': no_out
                     })
@@ -268,11 +598,8 @@ async def get_nfl_crypto_markets():
             per_team_best = []
             if poly_market and len(poly_market.outcomes) == 2 and len(kalshi_by_team) >= 1:
                 # Build dicts for quick lookup
-                poly_data_by_team = {normalize_nfl_team_name(o.name): {'price': o.price, 'american_odds': o.american_odds} for o in poly_market.outcomes}
-                kalshi_data_by_team = {k['team_normalized']: {
-                    'yes': {'price': k['yes']['price'], 'american_odds': k['yes']['american_odds']} if k.get('yes') else None,
-                    'no': {'price': k['no']['price'], 'american_odds': k['no']['american_odds']} if k.get('no') else None
-                } for k in kalshi_by_team}
+                poly_data_by_team = {poly_norm[o.name]: (o.price, o.american_odds) for o in poly_market.outcomes}
+                kalshi_data_by_team = {k['team_normalized']: k for k in kalshi_by_team}
                 # For each team, competitor is the other team if present
                 for idx, kteam in enumerate(kalshi_by_team):
                     team_norm = kteam['team_normalized']
@@ -281,31 +608,15 @@ async def get_nfl_crypto_markets():
                     if len(kalshi_by_team) == 2:
                         opp_norm = kalshi_by_team[1 - idx]['team_normalized']
                     
-                    candidates = []
-                    # Poly candidate (team win)
-                    if team_norm in poly_data_by_team:
-                        pd = poly_data_by_team[team_norm]
-                        candidates.append(('polymarket', 'polymarket_team', pd['price'], pd['american_odds']))
-                    # Kalshi team YES
-                    yes_d = kalshi_data_by_team.get(team_norm, {}).get('yes')
-                    if yes_d is not None:
-                        candidates.append(('kalshi', 'kalshi_yes', yes_d['price'], yes_d['american_odds']))
-                    # Opponent NO (equivalent to team win)
-                    if opp_norm and kalshi_data_by_team.get(opp_norm, {}).get('no') is not None:
-                        no_d = kalshi_data_by_team[opp_norm]['no']
-                        candidates.append(('kalshi', 'opponent_no', no_d['price'], no_d['american_odds']))
-                    
-                    if candidates:
-                        # Select the lowest implied probability (better payout)
-                        best = min(candidates, key=lambda x: x[2])
-                        per_team_best.append({
-                            'team_normalized': team_norm,
-                            'team_display': kteam['team_display'],
-                            'best_platform': best[0],
-                            'best_source': best[1],
-                            'best_price': best[2],
-                            'best_american_odds': best[3]
-                        })
+                    # Candidates in PER_TEAM_SOURCES order: Poly team win, Kalshi team YES,
+                    # opponent NO (equivalent to team win); the lowest price pays best
+                    yes_d = kalshi_data_by_team[team_norm].get('yes')
+                    no_d = kalshi_data_by_team[opp_norm].get('no') if opp_norm else None
+                    team_rows.append((per_team_best, team_norm, kteam['team_display'], (
+                        poly_data_by_team.get(team_norm),
+                        (yes_d['price'], yes_d['american_odds']) if yes_d else None,
+                        (no_d['price'], no_d['american_odds']) if no_d else None,
+                    )))
             
             comparison_item = {
                 "title": comp.question,
@@ -316,32 +627,24 @@ async def get_nfl_crypto_markets():
                 "per_team_best": per_team_best,
                 "polymarket": {
                     "market_id": poly_market.market_id if poly_market else None,
-                    "outcomes": [
-                        {
-                            "name": o.name,
-                            "price": o.price,
-                            "american_odds": o.american_odds
-                        } for o in poly_market.outcomes
-                    ] if poly_market else [],
+                    "outcomes": [o.to_price_dict() for o in poly_market.outcomes] if poly_market else [],
                     "volume": poly_market.total_volume if poly_market else 0,
                     "liquidity": poly_market.liquidity if poly_market else 0,
-                    "start_time": poly_market.start_time.isoformat() if poly_market and poly_market.start_time else None
+                    "start_time": poly_market.start_time if poly_market and poly_market.start_time else None
                 } if poly_market else None,
                 "kalshi": {
                     "market_id": best_kalshi_market.market_id if best_kalshi_market else None,
-                    "outcomes": [
-                        {
-                            "name": o.name,
-                            "price": o.price,
-                            "american_odds": o.american_odds
-                        } for o in best_kalshi_market.outcomes
-                    ] if best_kalshi_market else [],
+                    "outcomes": [o.to_price_dict() for o in best_kalshi_market.outcomes] if best_kalshi_market else [],
                     "volume": best_kalshi_market.total_volume if best_kalshi_market else 0,
                     "liquidity": best_kalshi_market.liquidity if best_kalshi_market else 0,
-                    "start_time": best_kalshi_market.start_time.isoformat() if best_kalshi_market and best_kalshi_market.start_time else None
+                    "start_time": best_kalshi_market.start_time if best_kalshi_market and best_kalshi_market.start_time else None
                 } if best_kalshi_market else None
             }
             comparison_data.append(comparison_item)
+            if comp.arbitrage_opportunity:
+                arbitrage_count += 1
+        
+        fill_per_team_best(team_rows)
         
         return {
             "comparisons": comparison_data,
@@ -349,9 +652,9 @@ async def get_nfl_crypto_markets():
                 "total_comparisons": len(comparison_data),
                 "polymarket_markets": len(game_markets),
                 "kalshi_markets": len(kalshi_markets),
-                "arbitrage_opportunities": sum(1 for c in comparison_data if c.get("arbitrage_opportunity", False))
+                "arbitrage_opportunities": arbitrage_count
             },
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
         
     except Exception as e:
@@ -367,7 +670,7 @@ async def get_nfl_traditional_odds():
     Get NFL odds from traditional sportsbooks via Odds API
     """
     try:
-        games = odds_client.fetch_nfl_odds()
+        games = await odds_client.fetch_nfl_odds_async()
         
         if not games:
             return {
@@ -380,8 +683,7 @@ async def get_nfl_traditional_odds():
         
         game_data = []
         for game in games:
-            best_odds = odds_client.get_best_odds_for_game(game)
-            all_odds = odds_client.get_all_odds_for_game(game)
+            best_odds, all_odds = odds_client.get_odds_for_game(game)
             
             game_item = {
                 "title": f"{game['away_team']} @ {game['home_team']}",
@@ -399,7 +701,7 @@ async def get_nfl_traditional_odds():
                 "total_games": len(game_data),
                 "bookmakers": len(games[0]['bookmakers']) if games else 0
             },
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
         
     except Exception as e:
@@ -410,6 +712,7 @@ async def get_nfl_traditional_odds():
 
 
 @app.get("/politics")
+@cached_endpoint(POLITICS_CACHE_TTL_SECONDS)
 async def get_politics_markets():
     """
     Get politics market comparisons from Polymarket and Kalshi
@@ -426,7 +729,9 @@ async def get_politics_markets():
             }
         
         comparison_data = []
+        arbitrage_count = 0
         
+        pairs = []
         for mapping in politics_mappings:
             poly_id = mapping.get('polymarket_id')
             kalshi_id = mapping.get('kalshi_id')
@@ -434,29 +739,33 @@ async def get_politics_markets():
             
             if not poly_id or not kalshi_id:
                 continue
-            
+            pairs.append((description, poly_id, kalshi_id))
+        
+        # All Polymarket markets in one batched request, alongside the Kalshi events
+        poly_markets, kalshi_results = await asyncio.gather(
+            poly_client.fetch_markets_by_ids_async([poly_id for _, poly_id, _ in pairs]),
+            _gather_bounded(
+                kalshi_client.fetch_market_by_event_ticker_async(kalshi_id) for _, _, kalshi_id in pairs
+            ),
+        )
+        
+        for (description, poly_id, _), kalshi_markets in zip(pairs, kalshi_results):
             try:
-                # Fetch markets
-                poly_market = poly_client.fetch_market_by_id(poly_id)
-                kalshi_markets = kalshi_client.fetch_market_by_event_ticker(kalshi_id)
+                if isinstance(kalshi_markets, Exception):
+                    raise kalshi_markets
+                poly_market = poly_markets.get(poly_id)
+                if poly_market:
+                    poly_market = with_live_prices(poly_market)
                 kalshi_market = kalshi_markets[0] if kalshi_markets else None
                 
                 if not poly_market or not kalshi_market:
                     continue
                 
                 # Get Yes prices
-                poly_yes_price = None
-                kalshi_yes_price = None
-                
-                for outcome in poly_market.outcomes:
-                    if 'yes' in outcome.name.lower():
-                        poly_yes_price = outcome.price
-                        break
-                
-                for outcome in kalshi_market.outcomes:
-                    if 'yes' in outcome.name.lower():
-                        kalshi_yes_price = outcome.price
-                        break
+                poly_yes = index_outcomes(poly_market).get('yes')
+                kalshi_yes = index_outcomes(kalshi_market).get('yes')
+                poly_yes_price = poly_yes.price if poly_yes else None
+                kalshi_yes_price = kalshi_yes.price if kalshi_yes else None
                 
                 if not poly_yes_price or not kalshi_yes_price:
                     continue
@@ -465,37 +774,29 @@ async def get_politics_markets():
                 price_spread = abs(poly_yes_price - kalshi_yes_price) * 100
                 best_platform = "polymarket" if poly_yes_price > kalshi_yes_price else "kalshi"
                 
+                arbitrage_opportunity = price_spread > 5.0
+                
                 comparison_item = {
                     "title": description,
                     "price_spread": price_spread,
                     "best_platform": best_platform,
-                    "arbitrage_opportunity": price_spread > 5.0,
+                    "arbitrage_opportunity": arbitrage_opportunity,
                     "polymarket": {
                         "market_id": poly_market.market_id,
-                        "outcomes": [
-                            {
-                                "name": o.name,
-                                "price": o.price,
-                                "american_odds": o.american_odds
-                            } for o in poly_market.outcomes
-                        ],
+                        "outcomes": [o.to_price_dict() for o in poly_market.outcomes],
                         "volume": poly_market.total_volume,
                         "liquidity": poly_market.liquidity
                     },
                     "kalshi": {
                         "market_id": kalshi_market.market_id,
-                        "outcomes": [
-                            {
-                                "name": o.name,
-                                "price": o.price,
-                                "american_odds": o.american_odds
-                            } for o in kalshi_market.outcomes
-                        ],
+                        "outcomes": [o.to_price_dict() for o in kalshi_market.outcomes],
                         "volume": kalshi_market.total_volume,
                         "liquidity": kalshi_market.liquidity
                     }
                 }
                 comparison_data.append(comparison_item)
+                if arbitrage_opportunity:
+                    arbitrage_count += 1
                 
             except Exception as e:
                 print(f"Error processing politics market {description}: {e}")
@@ -505,9 +806,9 @@ async def get_politics_markets():
             "comparisons": comparison_data,
             "summary": {
                 "total_comparisons": len(comparison_data),
-                "arbitrage_opportunities": sum(1 for c in comparison_data if c.get("arbitrage_opportunity", False))
+                "arbitrage_opportunities": arbitrage_count
             },
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
         
     except Exception as e:
@@ -518,6 +819,7 @@ async def get_politics_markets():
 
 
 @app.get("/crypto")
+@cached_endpoint(CRYPTO_CACHE_TTL_SECONDS)
 async def get_crypto_markets():
     """
     Get crypto market comparisons from Polymarket and Kalshi
@@ -532,11 +834,13 @@ async def get_crypto_markets():
                     "total_comparisons": 0,
                     "arbitrage_opportunities": 0
                 },
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now()
             }
         
         comparison_data = []
+        arbitrage_count = 0
         
+        entries = []
         for mapping in crypto_mappings:
             poly_id = mapping.get('polymarket_id')
             kalshi_id = mapping.get('kalshi_id')
@@ -546,15 +850,33 @@ async def get_crypto_markets():
             # Skip if no IDs are provided at all
             if not poly_id and not kalshi_id and not limitless_id:
                 continue
-            
+            entries.append((description, poly_id, kalshi_id, limitless_id))
+        
+        async def fetch_mapping(kalshi_id, limitless_id):
+            # Fetch markets (only if IDs are provided)
+            kalshi_markets, limitless_market = await asyncio.gather(
+                kalshi_client.fetch_market_by_event_ticker_async(kalshi_id) if kalshi_id else _none(),
+                limitless_client.fetch_market_by_id_async(limitless_id) if limitless_id else _none(),
+            )
+            kalshi_market = kalshi_markets[0] if kalshi_markets else None
+            return kalshi_market, limitless_market
+        
+        # All Polymarket markets in one batched request, alongside the per-mapping Kalshi/Limitless lookups
+        poly_markets, fetched = await asyncio.gather(
+            poly_client.fetch_markets_by_ids_async([poly_id for _, poly_id, _, _ in entries if poly_id]),
+            _gather_bounded(
+                fetch_mapping(kalshi_id, limitless_id) for _, _, kalshi_id, limitless_id in entries
+            ),
+        )
+        
+        for (description, poly_id, _, _), result in zip(entries, fetched):
             try:
-                # Fetch markets (only if IDs are provided)
-                poly_market = poly_client.fetch_market_by_id(poly_id) if poly_id else None
-                kalshi_market = None
-                if kalshi_id:
-                    kalshi_markets = kalshi_client.fetch_market_by_event_ticker(kalshi_id)
-                    kalshi_market = kalshi_markets[0] if kalshi_markets else None
-                limitless_market = limitless_client.fetch_market_by_id(limitless_id) if limitless_id else None
+                if isinstance(result, Exception):
+                    raise result
+                poly_market = poly_markets.get(poly_id) if poly_id else None
+                if poly_market:
+                    poly_market = with_live_prices(poly_market)
+                kalshi_market, limitless_market = result
                 
                 # Skip only if we have no valid markets
                 valid_markets = [m for m in [poly_market, kalshi_market, limitless_market] if m is not None]
@@ -562,27 +884,13 @@ async def get_crypto_markets():
                     continue
                 
                 # Get Yes prices (only for available markets)
-                poly_yes_price = None
-                kalshi_yes_price = None
-                limitless_yes_price = None
-                
-                if poly_market:
-                    for outcome in poly_market.outcomes:
-                        if 'yes' in outcome.name.lower():
-                            poly_yes_price = outcome.price
-                            break
-                
-                if kalshi_market:
-                    for outcome in kalshi_market.outcomes:
-                        if 'yes' in outcome.name.lower():
-                            kalshi_yes_price = outcome.price
-                            break
-                
-                if limitless_market:
-                    for outcome in limitless_market.outcomes:
-                        if 'yes' in outcome.name.lower():
-                            limitless_yes_price = outcome.price
-                            break
+                poly_yes, kalshi_yes, limitless_yes = (
+                    index_outcomes(market).get('yes') if market else None
+                    for market in (poly_market, kalshi_market, limitless_market)
+                )
+                poly_yes_price = poly_yes.price if poly_yes else None
+                kalshi_yes_price = kalshi_yes.price if kalshi_yes else None
+                limitless_yes_price = limitless_yes.price if limitless_yes else None
                 
                 # Get valid prices
                 valid_prices = []
@@ -596,60 +904,51 @@ async def get_crypto_markets():
                 if len(valid_prices) < 1:
                     continue
                 
-                # Calculate spread (find max and min prices across available platforms)
-                prices = [price for _, price in valid_prices]
-                max_price = max(prices)
-                min_price = min(prices)
-                
-                # If only 1 platform, spread is 0
-                price_spread = (max_price - min_price) * 100 if len(valid_prices) > 1 else 0
+                if len(valid_prices) == 1:
+                    # If only 1 platform, spread is 0
+                    best_platform = valid_prices[0][0]
+                    price_spread = 0
+                else:
+                    # One pass: the highest price (first on ties) picks the best platform,
+                    # the spread is max - min across available platforms
+                    best_platform, max_price = valid_prices[0]
+                    min_price = max_price
+                    for platform, price in valid_prices[1:]:
+                        if price > max_price:
+                            best_platform, max_price = platform, price
+                        elif price < min_price:
+                            min_price = price
+                    price_spread = (max_price - min_price) * 100
                 
-                # Determine best platform
-                best_platform = next(platform for platform, price in valid_prices if price == max_price)
+                arbitrage_opportunity = price_spread > 5.0
                 
                 comparison_item = {
                     "title": description,
                     "price_spread": price_spread,
                     "best_platform": best_platform,
-                    "arbitrage_opportunity": price_spread > 5.0,
+                    "arbitrage_opportunity": arbitrage_opportunity,
                     "polymarket": {
                         "market_id": poly_market.market_id,
-                        "outcomes": [
-                            {
-                                "name": o.name,
-                                "price": o.price,
-                                "american_odds": o.american_odds
-                            } for o in poly_market.outcomes
-                        ],
+                        "outcomes": [o.to_price_dict() for o in poly_market.outcomes],
                         "volume": poly_market.total_volume,
                         "liquidity": poly_market.liquidity
                     } if poly_market else None,
                     "kalshi": {
                         "market_id": kalshi_market.market_id,
-                        "outcomes": [
-                            {
-                                "name": o.name,
-                                "price": o.price,
-                                "american_odds": o.american_odds
-                            } for o in kalshi_market.outcomes
-                        ],
+                        "outcomes": [o.to_price_dict() for o in kalshi_market.outcomes],
                         "volume": kalshi_market.total_volume,
                         "liquidity": kalshi_market.liquidity
                     } if kalshi_market else None,
                     "limitless": {
                         "market_id": limitless_market.market_id,
-                        "outcomes": [
-                            {
-                                "name": o.name,
-                                "price": o.price,
-                                "american_odds": o.american_odds
-                            } for o in limitless_market.outcomes
-                        ],
+                        "outcomes": [o.to_price_dict() for o in limitless_market.outcomes],
                         "volume": limitless_market.total_volume,
                         "liquidity": limitless_market.liquidity
                     } if limitless_market else None
                 }
                 comparison_data.append(comparison_item)
+                if arbitrage_opportunity:
+                    arbitrage_count += 1
                 
             except Exception as e:
                 print(f"Error processing crypto market {description}: {e}")
@@ -659,9 +958,9 @@ async def get_crypto_markets():
             "comparisons": comparison_data,
             "summary": {
                 "total_comparisons": len(comparison_data),
-                "arbitrage_opportunities": sum(1 for c in comparison_data if c.get("arbitrage_opportunity", False))
+                "arbitrage_opportunities": arbitrage_count
             },
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
         
     except Exception as e:
@@ -673,72 +972,59 @@ async def get_crypto_markets():
 
 # ===================== Others (external matched markets) =====================
 @app.get("/others")
+@cached_endpoint(OTHERS_CACHE_TTL_SECONDS)
 async def get_others_matched_markets(limit: int = Query(10, ge=1, le=100), offset: int = Query(0, ge=0)):
     """
     Proxy external matched markets API (Polymarket + Kalshi) and normalize
     to the same structure used by politics comparisons.
     """
     try:
-        global _others_cache_payload, _others_cache_limit, _others_cache_offset, _others_cache_ts
-        url = f"https://monitorthesituation.lol/api/bff/matches?top_k=1&limit={limit}&offset={offset}"
-        headers = {"accept": "*/*"}
-        # Serve from cache when fresh and matching params
-        now = time.time()
-        if (
-            _others_cache_payload is not None
-            and _others_cache_limit == limit
-            and _others_cache_offset == offset
-            and (now - _others_cache_ts) < OTHERS_CACHE_TTL_SECONDS
-        ):
-            return _others_cache_payload
-
-        # Lock and re-check inside to avoid stampede
-        async with _others_cache_lock:
-            now = time.time()
-            if (
-                _others_cache_payload is not None
-                and _others_cache_limit == limit
-                and _others_cache_offset == offset
-                and (now - _others_cache_ts) < OTHERS_CACHE_TTL_SECONDS
-            ):
-                return _others_cache_payload
-
-            # Run blocking HTTP in a thread to avoid blocking the event loop
-            resp = await asyncio.to_thread(requests.get, url, headers=headers, timeout=10)
-        if resp.status_code != 200:
+        try:
+            raw = await matches_client.fetch_matches_async(limit=limit, offset=offset)
+        except ResponseTooLargeError:
+            raise HTTPException(status_code=502, detail="Upstream matches API response too large")
+        except AIO_ERRORS:
             raise HTTPException(status_code=502, detail="Upstream matches API error")
-        raw = resp.json() or {}
-
-        def to_fraction(val):
-            try:
-                if val is None:
-                    return None
-                n = float(val)
-                if n > 1:
-                    n = max(0.0, min(1.0, n / 100.0))
-                else:
-                    n = max(0.0, min(1.0, n))
-                return n
-            except Exception:
-                return None
 
-        comparisons = []
-        for item in (raw.get("data") or []):
+        # Gather pass: per-item fields, with prices collected column-wise
+        items = raw.get("data") or []
+        rows = []
+        for item in items:
             best = (item.get("best") or {}).get("market") or {}
             source = item.get("source") or {}
+            rows.append((
+                best.get("title") or source.get("title") or "Matched Market",
+                source,
+                best,
+                to_fraction(_first_present(source, "yes_ask", "yes_bid", "last_price")),
+                to_fraction(_first_present(best, "yes_ask", "yes_bid", "last_price")),
+            ))
 
-            title = best.get("title") or source.get("title") or "Matched Market"
-
-            kalshi_yes = to_fraction(best.get("yes_ask", best.get("yes_bid", best.get("last_price"))))
-            poly_yes = to_fraction(source.get("yes_ask", source.get("yes_bid", source.get("last_price"))))
+        # Whole-page arithmetic on price arrays; NaN marks a missing price
+        n = len(rows)
+        poly_yes = np.fromiter((row[3] if row[3] is not None else np.nan for row in rows), dtype=np.float64, count=n)
+        kalshi_yes = np.fromiter((row[4] if row[4] is not None else np.nan for row in rows), dtype=np.float64, count=n)
+        poly_yes_or_0 = np.nan_to_num(poly_yes, nan=0.0)
+        kalshi_yes_or_0 = np.nan_to_num(kalshi_yes, nan=0.0)
+        # Spread is 0 unless both sides are priced
+        spread = np.nan_to_num(np.abs(poly_yes - kalshi_yes) * 100.0, nan=0.0)
+        best_is_poly = poly_yes_or_0 > kalshi_yes_or_0
+        arbitrage = spread > 5.0
 
+        comparisons = []
+        for (title, source, best), p_yes, p_no, k_yes, k_no, row_spread, row_best_is_poly, row_arbitrage in zip(
+            (row[:3] for row in rows),
+            poly_yes_or_0.tolist(), (1.0 - poly_yes_or_0).tolist(),
+            kalshi_yes_or_0.tolist(), (1.0 - kalshi_yes_or_0).tolist(),
+            spread.tolist(), best_is_poly.tolist(), arbitrage.tolist(),
+        ):
             polymarket = None
             if source:
                 polymarket = {
                     "market_id": source.get("market_ref_id") or source.get("id") or "",
                     "outcomes": [
-                        {"name": "Yes", "price": poly_yes or 0.0, "american_odds": ""},
-                        {"name": "No", "price": 1 - (poly_yes or 0.0), "american_odds": ""},
+                        {"name": "Yes", "price": p_yes, "american_odds": ""},
+                        {"name": "No", "price": p_no, "american_odds": ""},
                     ],
                     "volume": source.get("volume") or 0,
                     "liquidity": float(source.get("liquidity") or 0),
@@ -749,25 +1035,18 @@ async def get_others_matched_markets(limit: int = Query(10, ge=1, le=100), offse
                 kalshi = {
                     "market_id": best.get("market_ref_id") or best.get("id") or "",
                     "outcomes": [
-                        {"name": "Yes", "price": kalshi_yes or 0.0, "american_odds": ""},
-                        {"name": "No", "price": 1 - (kalshi_yes or 0.0), "american_odds": ""},
+                        {"name": "Yes", "price": k_yes, "american_odds": ""},
+                        {"name": "No", "price": k_no, "american_odds": ""},
                     ],
                     "volume": best.get("volume") or 0,
                     "liquidity": float(best.get("liquidity") or 0),
                 }
 
-            spread = 0.0
-            if poly_yes is not None and kalshi_yes is not None:
-                spread = abs(poly_yes - kalshi_yes) * 100.0
-            best_platform = (
-                "polymarket" if (poly_yes or 0) > (kalshi_yes or 0) else "kalshi"
-            )
-
             comparisons.append({
                 "title": title,
-                "price_spread": spread,
-                "best_platform": best_platform,
-                "arbitrage_opportunity": spread > 5.0,
+                "price_spread": row_spread,
+                "best_platform": "polymarket" if row_best_is_poly else "kalshi",
+                "arbitrage_opportunity": row_arbitrage,
                 "polymarket": polymarket,
                 "kalshi": kalshi,
             })
@@ -776,20 +1055,13 @@ async def get_others_matched_markets(limit: int = Query(10, ge=1, le=100), offse
             "comparisons": comparisons,
             "summary": {
                 "total_comparisons": len(comparisons),
-                "arbitrage_opportunities": sum(1 for c in comparisons if c.get("arbitrage_opportunity")),
+                "arbitrage_opportunities": int(np.count_nonzero(arbitrage)),
             },
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(),
             "limit": limit,
             "offset": offset,
         }
 
-        # Update cache
-        async with _others_cache_lock:
-            _others_cache_payload = payload
-            _others_cache_limit = limit
-            _others_cache_offset = offset
-            _others_cache_ts = time.time()
-
         return payload
     except HTTPException:
         raise
@@ -800,55 +1072,78 @@ async def get_others_matched_markets(limit: int = Query(10, ge=1, le=100), offse
  
 
 
+# How long shutdown may take after SIGINT/SIGTERM before the process is killed outright
+SHUTDOWN_FORCE_EXIT_SECONDS = 5
+
+
 def start_server(host: str = "0.0.0.0", port: int = 8000):
     """Start the FastAPI server with robust signal handling."""
     import uvicorn
-    import os
 
-    # Zero graceful timeout to avoid hanging on shutdown with active websocket tasks
+    class _Server(uvicorn.Server):
+        """uvicorn.Server that hard-exits if a graceful shutdown hangs"""
+
+        _force_exit_timer = None
+
+        def handle_exit(self, sig, frame):
+            # uvicorn stops accepting, closes connections and runs the shutdown hooks
+            super().handle_exit(sig, frame)
+            if self._force_exit_timer is None:
+                self._force_exit_timer = threading.Timer(
+                    SHUTDOWN_FORCE_EXIT_SECONDS, self._force_exit, args=(sig,)
+                )
+                self._force_exit_timer.daemon = True
+                self._force_exit_timer.start()
+
+        @staticmethod
+        def _force_exit(sig):
+            try:
+                print("\n\n⚠️  Shutdown is taking too long, force-stopping server...\n")
+            except Exception:
+                pass
+            os._exit(130 if sig == signal.SIGINT else 143)
+
+    # Zero graceful timeout to avoid hanging on shutdown with active websocket tasks.
+    # "auto" picks uvloop and httptools (requirements.txt) when installed, else asyncio/h11
     config = uvicorn.Config(
         app,
         host=host,
         port=port,
         log_level="info",
+        loop="auto",
+        http="auto",
         timeout_graceful_shutdown=0,
     )
-    server = uvicorn.Server(config)
+    server = _Server(config)
 
-    def _force_exit(signum, frame):
-        try:
-            print("\n\n⚠️  Received signal, force-stopping server...\n")
-        except Exception:
-            pass
-        try:
-            server.should_exit = True
-        except Exception:
-            pass
-        os._exit(130 if signum == signal.SIGINT else 143)
-
-    # Ensure Ctrl+C/SIGTERM always terminates promptly
-    signal.signal(signal.SIGINT, _force_exit)
-    signal.signal(signal.SIGTERM, _force_exit)
-
-    server.run()
+    # uvicorn installs its own SIGINT/SIGTERM handlers while serving and routes them to handle_exit
+    try:
+        server.run()
+    except KeyboardInterrupt:
+        # Newer uvicorn re-raises the captured SIGINT once shutdown has finished
+        pass
 
 
 @app.get("/rundown")
+@cached_endpoint(RUNDOWN_CACHE_TTL_SECONDS)
 async def get_rundown_markets(date_param: Optional[str] = Query(None, alias="date"), sport_id: int = Query(2, ge=1)):
     """
     Get rundown market data from The Rundown API
     """
     try:
-        # Use provided date (YYYY-MM-DD), else today's date
+        # Use timezone-aware current time in UTC for consistent comparisons
+        now = datetime.now(timezone.utc)
+        today = now.date()
+        # Use provided date (YYYY-MM-DD), else today's UTC date (The Rundown's events/{date} day)
         if date_param:
             try:
                 event_date = datetime.strptime(date_param, "%Y-%m-%d").date()
             except Exception:
                 raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
         else:
-            event_date = datetime.now().date()
+            event_date = today
         # Fetch events for the requested sport (default NFL=2)
-        rundown_data = rundown_client.get_events_by_date(sport_id=sport_id, event_date=event_date)
+        rundown_data = await rundown_client.get_events_by_date_async(sport_id=sport_id, event_date=event_date)
         
         events = rundown_data.get("events", [])
         
@@ -856,13 +1151,12 @@ async def get_rundown_markets(date_param: Optional[str] = Query(None, alias="dat
             return {
                 "events": [],
                 "summary": {"total_events": 0, "total_bookmakers": 0},
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now()
             }
             
         processed_events = []
         all_bookmakers = set()
-        # Use timezone-aware current time in UTC for consistent comparisons
-        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(hours=2)
 
         for event in events:
             # Filter future games for today with a 2-hour buffer window
@@ -870,38 +1164,33 @@ async def get_rundown_markets(date_param: Optional[str] = Query(None, alias="dat
             if event_date_str:
                 try:
                     # Parse event date and time
-                    event_datetime = date_parser.parse(event_date_str)
+                    event_datetime = parse_iso_datetime(event_date_str)
                     if event_datetime.tzinfo is None:
                         event_datetime = event_datetime.replace(tzinfo=timezone.utc)
                     
                     # If event is today, include only if it starts after (now - 2 hours)
                     # This keeps a small buffer to account for timing drift and late-starting games
-                    if event_datetime.date() == now.date() and event_datetime <= (now - timedelta(hours=2)):
+                    if event_datetime.date() == today and event_datetime <= cutoff:
                         continue
                 except Exception:
                     # If parsing fails, include the event
                     pass
 
-            home_team = ""
-            away_team = ""
-            for team in event.get("teams", []):
-                if team.get("is_home"):
-                    home_team = team.get("name")
-                if team.get("is_away"):
-                    away_team = team.get("name")
-
-            lines = []
-            if "lines" in event and event["lines"]:
-                for line_data in event["lines"].values():
-                    affiliate_name = line_data.get("affiliate", {}).get("affiliate_name")
-                    if affiliate_name:
-                        all_bookmakers.add(affiliate_name)
-                        moneyline = line_data.get("moneyline", {})
-                        lines.append({
-                            "affiliate_name": affiliate_name,
-                            "moneyline_home": moneyline.get("moneyline_home"),
-                            "moneyline_away": moneyline.get("moneyline_away"),
-                        })
+            teams = event.get("teams", [])
+            home_team = next((team.get("name") for team in teams if team.get("is_home")), "")
+            away_team = next((team.get("name") for team in teams if team.get("is_away")), "")
+
+            lines = [
+                {
+                    "affiliate_name": affiliate_name,
+                    "moneyline_home": moneyline.get("moneyline_home"),
+                    "moneyline_away": moneyline.get("moneyline_away"),
+                }
+                for line_data in (event.get("lines") or {}).values()
+                if (affiliate_name := line_data.get("affiliate", {}).get("affiliate_name"))
+                for moneyline in (line_data.get("moneyline", {}),)
+            ]
+            all_bookmakers.update(line["affiliate_name"] for line in lines)
 
             processed_events.append({
                 "event_id": event.get("event_id"),
@@ -918,8 +1207,8 @@ async def get_rundown_markets(date_param: Optional[str] = Query(None, alias="dat
                 "total_events": len(processed_events),
                 "total_bookmakers": len(all_bookmakers)
             },
-            "timestamp": datetime.now().isoformat(),
-            "requested_date": event_date.isoformat(),
+            "timestamp": datetime.now(),
+            "requested_date": event_date,
             "requested_sport_id": sport_id
         }
     except Exception as e:
@@ -8,7 +8,7 @@ from pymongo import MongoClient, ASCENDING, DESCENDING
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import os
-import json
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -70,14 +70,14 @@ class MarketDBManager:
             # Parse outcomes (JSON string to list)
             outcomes_str = polymarket_response.get('outcomes', '[]')
             if isinstance(outcomes_str, str):
-                outcomes = json.loads(outcomes_str)
+                outcomes = orjson.loads(outcomes_str)
             else:
                 outcomes = outcomes_str
             
             # Parse prices (JSON string to list)
             prices_str = polymarket_response.get('outcomePrices', '[]')
             if isinstance(prices_str, str):
-                prices = json.loads(prices_str)
+                prices = orjson.loads(prices_str)
             else:
                 prices = prices_str
             
@@ -101,7 +101,7 @@ class MarketDBManager:
             
             return result
             
-        except (json.JSONDecodeError, ValueError, TypeError) as e:
+        except (orjson.JSONDecodeError, ValueError, TypeError) as e:
             print(f"⚠️  Error extracting Polymarket prices: {e}")
             return {
                 "volume": polymarket_response.get('volume'),
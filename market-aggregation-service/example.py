@@ -36,7 +36,6 @@ def main():
     markets = aggregator.fetch_all_markets(
         include_polymarket=True,
         include_kalshi=True,
-        include_limitless=True,
         limit_per_platform=50  # Start with 50 per platform for faster testing
     )
     
@@ -38,7 +38,6 @@ def run_single_aggregation():
     markets = aggregator.fetch_all_markets(
         include_polymarket=True,
         include_kalshi=True,
-        include_limitless=True,
         limit_per_platform=100
     )
     
@@ -65,6 +65,38 @@ MANUAL_MAPPINGS = {
 }
 
 
+def _flatten_mappings(mappings: dict) -> list:
+    """Flatten category -> mappings into (category, polymarket_id, kalshi_id, description) tuples"""
+    return [
+        (category, mapping.get("polymarket_id"), mapping.get("kalshi_id"), mapping.get("description"))
+        for category, category_mappings in mappings.items()
+        for mapping in category_mappings
+    ]
+
+
+def _index_mappings(mappings: dict) -> dict:
+    """Index mappings by (platform, market_id) for every *_id field they contain"""
+    index = {}
+    for category, category_mappings in mappings.items():
+        for mapping in category_mappings:
+            _add_to_index(index, category, mapping)
+    return index
+
+
+def _add_to_index(index: dict, category: str, mapping: dict):
+    """Add one mapping to a (platform, market_id) index"""
+    for key, market_id in mapping.items():
+        if key.endswith("_id") and market_id:
+            index.setdefault((key[:-len("_id")], market_id), []).append((category, mapping))
+
+
+# Flattened once at import so matching doesn't walk the nested config on every run
+FLAT_MAPPINGS = _flatten_mappings(MANUAL_MAPPINGS)
+
+# (platform, market_id) -> [(category, mapping), ...] in config order
+MAPPINGS_BY_MARKET_ID = _index_mappings(MANUAL_MAPPINGS)
+
+
 def get_manual_mappings(category: str = None) -> dict:
     """
     Get manual market mappings for a specific category or all categories.
@@ -95,18 +127,14 @@ def find_matching_market_ids(platform: str, market_id: str, category: str = None
     """
     result = {"polymarket_id": None, "kalshi_id": None}
     
-    # Search in specified category or all categories
-    categories_to_search = [category] if category else MANUAL_MAPPINGS.keys()
-    
-    for cat in categories_to_search:
-        mappings = MANUAL_MAPPINGS.get(cat, [])
-        for mapping in mappings:
-            # Check if this mapping contains our market
-            if mapping.get(f"{platform}_id") == market_id:
-                # Found it! Return all mapped IDs
-                result["polymarket_id"] = mapping.get("polymarket_id")
-                result["kalshi_id"] = mapping.get("kalshi_id")
-                return result
+    # Mappings containing our market, restricted to the category if given
+    for cat, mapping in MAPPINGS_BY_MARKET_ID.get((platform, market_id), []):
+        if category and cat != category:
+            continue
+        # Found it! Return all mapped IDs
+        result["polymarket_id"] = mapping.get("polymarket_id")
+        result["kalshi_id"] = mapping.get("kalshi_id")
+        return result
     
     return result
 
@@ -137,6 +165,8 @@ def add_mapping(category: str, polymarket_id: str = None, kalshi_id: str = None,
     mapping = {k: v for k, v in mapping.items() if v is not None}
     
     MANUAL_MAPPINGS[category].append(mapping)
+    FLAT_MAPPINGS.append((category, polymarket_id, kalshi_id, description))
+    _add_to_index(MAPPINGS_BY_MARKET_ID, category, mapping)
     
     print(f"✅ Added mapping to category '{category}':")
     print(f"   {mapping}")
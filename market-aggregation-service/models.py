@@ -2,9 +2,13 @@
 Data models for the market aggregation service
 """
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, FrozenSet, Tuple
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
+import numpy as np
+from dateutil import parser as date_parser
+from rapidfuzz.utils import default_process
 
 class Platform(Enum):
     """Supported platforms"""
@@ -20,7 +24,7 @@ class MarketType(Enum):
     ENTERTAINMENT = "entertainment"
     OTHER = "other"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MarketOutcome:
     """Represents a single outcome in a market"""
     name: str
@@ -41,8 +45,12 @@ class MarketOutcome:
             "best_ask": self.best_ask,
             "volume": self.volume
         }
+    
+    def to_price_dict(self) -> Dict[str, Any]:
+        """The name/price/american_odds subset the API responses show"""
+        return {"name": self.name, "price": self.price, "american_odds": self.american_odds}
 
-@dataclass
+@dataclass(slots=True)
 class UnifiedMarket:
     """Unified market data structure across all platforms"""
     platform: Platform
@@ -65,6 +73,12 @@ class UnifiedMarket:
     total_volume: Optional[float] = None
     liquidity: Optional[float] = None
     
+    # Hot raw_data fields promoted to attributes at parse time: Polymarket's
+    # bid/ask spread (0.0 when not reported) and Kalshi's team subtitles
+    spread: float = 0.0
+    yes_sub_title: str = ""
+    subtitle: str = ""
+    
     # Status
     is_active: bool = True
     is_closed: bool = False
@@ -72,13 +86,30 @@ class UnifiedMarket:
     # Original data
     raw_data: Dict[str, Any] = field(default_factory=dict)
     
-    # Normalized fields for matching
+    # Normalized fields for matching (derived from question in __post_init__ when not given)
     normalized_title: str = ""
     normalized_teams: List[str] = field(default_factory=list)
     
+    # normalized_title after rapidfuzz default_process, and its tokens
+    processed_title: str = field(default="", repr=False)
+    title_tokens: FrozenSet[str] = field(default=frozenset(), repr=False)
+    
     # Timestamp
     fetched_at: datetime = field(default_factory=datetime.utcnow)
     
+    def __post_init__(self):
+        # Normalize once at construction so matching never recomputes these per pair
+        if not self.normalized_title:
+            self.normalized_title = normalize_market_title(self.question)
+        if not self.normalized_teams:
+            self.normalized_teams = extract_team_names(self.question)
+        if not self.processed_title:
+            self.processed_title, tokens = process_title(self.normalized_title)
+            if not self.title_tokens:
+                self.title_tokens = tokens
+        if not self.title_tokens:
+            self.title_tokens = frozenset(self.processed_title.split())
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "platform": self.platform.value,
@@ -101,7 +132,7 @@ class UnifiedMarket:
             "fetched_at": self.fetched_at.isoformat()
         }
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MarketComparison:
     """Comparison of the same market across different platforms"""
     question: str
@@ -139,7 +170,7 @@ class MarketComparison:
             "last_updated": self.last_updated.isoformat()
         }
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PriceHistory:
     """Track price history for a market on a platform"""
     platform: Platform
@@ -159,12 +190,14 @@ class PriceHistory:
             "volume": self.volume
         }
 
+@lru_cache(maxsize=1024)
 def calculate_decimal_odds(probability: float) -> float:
     """Convert probability to decimal odds"""
     if probability <= 0 or probability >= 1:
         return 0.0
     return round(1.0 / probability, 2)
 
+@lru_cache(maxsize=1024)
 def calculate_american_odds(probability: float) -> str:
     """Convert probability to American odds format"""
     if probability <= 0 or probability >= 1:
@@ -181,6 +214,51 @@ def calculate_american_odds(probability: float) -> str:
         american = int(-100 / (decimal - 1))
         return str(american)
 
+def calculate_odds_batch(probabilities: List[float]) -> List[Tuple[float, str]]:
+    """
+    (decimal odds, American odds) for many probabilities in one vectorized pass
+    
+    Same results as calculate_decimal_odds / calculate_american_odds, which
+    remain the better choice for a handful of values. Every probability must
+    lie strictly between 0 and 1.
+    """
+    if not probabilities:
+        return []
+    decimal = 1.0 / np.asarray(probabilities, dtype=np.float64)
+    underdog = decimal >= 2.0
+    american = np.where(underdog, (decimal - 1) * 100, -100 / (decimal - 1)).astype(np.int64)
+    return [
+        (d, f"+{a}" if u else str(a))
+        for d, a, u in zip(np.round(decimal, 2).tolist(), american.tolist(), underdog.tolist())
+    ]
+
+def index_outcomes(market: UnifiedMarket) -> Dict[str, MarketOutcome]:
+    """
+    Index a market's outcomes by side in one pass
+    
+    Names containing "yes" map to 'yes', names containing "no" to 'no', anything
+    else to its lowercased name. The first outcome wins for each key.
+    """
+    index = {}
+    for outcome in market.outcomes:
+        name = outcome.name.lower()
+        key = 'yes' if 'yes' in name else 'no' if 'no' in name else name
+        index.setdefault(key, outcome)
+    return index
+
+def parse_iso_datetime(value: str) -> datetime:
+    """
+    Parse an API timestamp string
+    
+    Tries datetime.fromisoformat (C implementation) first, which covers the ISO
+    8601 forms the platforms return, and falls back to dateutil for anything else.
+    """
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return date_parser.parse(value)
+
+@lru_cache(maxsize=8192)
 def normalize_market_title(title: str) -> str:
     """Normalize market title for comparison across platforms"""
     # Convert to lowercase
@@ -203,8 +281,19 @@ def normalize_market_title(title: str) -> str:
     
     return normalized
 
+@lru_cache(maxsize=8192)
+def process_title(normalized_title: str) -> Tuple[str, FrozenSet[str]]:
+    """rapidfuzz default_process of a normalized title, plus its token set"""
+    processed = default_process(normalized_title)
+    return processed, frozenset(processed.split())
+
 def extract_team_names(title: str) -> List[str]:
     """Extract team/participant names from market title"""
+    return list(_extract_team_names(title))
+
+@lru_cache(maxsize=8192)
+def _extract_team_names(title: str) -> Tuple[str, ...]:
+    """Cached implementation of extract_team_names (tuple so cached results can't be mutated)"""
     teams = []
     
     # Look for "vs" patterns
@@ -219,9 +308,7 @@ def extract_team_names(title: str) -> List[str]:
         teams = [p.strip() for p in parts]
     
     # Normalize team names
-    teams = [normalize_market_title(t) for t in teams]
-    
-    return teams
+    return tuple(normalize_market_title(t) for t in teams)
 
 def calculate_arbitrage(outcomes: List[float]) -> tuple[bool, Optional[float]]:
     """
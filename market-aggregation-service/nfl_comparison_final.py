@@ -14,7 +14,6 @@ import sys
 import os
 import json
 from datetime import datetime, timedelta, timezone
-from dateutil import parser as date_parser
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from api_clients.polymarket_client import PolymarketClient
@@ -44,22 +43,21 @@ def filter_future_markets(markets):
     print(f"Filtering {len(markets)} markets by time and spread...")
     
     for market in markets:
-        # Check if market has gameStartTime in raw_data
-        game_start_time_str = market.raw_data.get("gameStartTime")
-        spread = market.raw_data.get('spread', 0.0)
-        
         # Only include markets with spread <= 0.05 (liquid markets)
-        if spread <= 0.05 and game_start_time_str:
-            try:
-                game_start_time = date_parser.parse(game_start_time_str)
-                if game_start_time.tzinfo is None:
-                    game_start_time = game_start_time.replace(tzinfo=timezone.utc)
-                
-                if game_start_time > now:
-                    future_markets.append(market)
-            except Exception as e:
-                print(f"Warning: Error parsing time for market {market.market_id}: {e}")
-                continue
+        if market.spread > 0.05:
+            continue
+        
+        # start_time is gameStartTime, already parsed by the Polymarket client
+        game_start_time = market.start_time
+        if game_start_time is None:
+            if market.raw_data.get("gameStartTime"):
+                print(f"Warning: Error parsing time for market {market.market_id}")
+            continue
+        if game_start_time.tzinfo is None:
+            game_start_time = game_start_time.replace(tzinfo=timezone.utc)
+        
+        if game_start_time > now:
+            future_markets.append(market)
     
     print(f"Found {len(future_markets)} markets with spread <= 0.05 and future start time")
     return future_markets
@@ -137,7 +135,7 @@ def fetch_nfl_game_markets():
             print("\nExample Polymarket game markets:")
             for market in game_markets[:5]:
                 print(f"  • {market.question}")
-                spread = market.raw_data.get('spread', 'N/A')
+                spread = market.spread
                 print(f"    Spread: {spread}, Outcomes: {[o.name for o in market.outcomes]}")
     
     except Exception as e:
@@ -195,11 +193,8 @@ def fetch_traditional_sportsbook_odds():
     print("[BONUS] Fetching Traditional Sportsbook Odds")
     print("=" * 70 + "\n")
     
-    # API key from user's request
-    api_key = "db06be1d18367c369444aa40d6a25499"
-    
     try:
-        client = OddsAPIClient(api_key)
+        client = OddsAPIClient()
         games = client.fetch_nfl_odds()
         
         if not games:
@@ -211,8 +206,7 @@ def fetch_traditional_sportsbook_odds():
         
         for game in games:
             game_key = f"{game['away_team']} @ {game['home_team']}"
-            best_odds = client.get_best_odds_for_game(game)
-            all_odds = client.get_all_odds_for_game(game)
+            best_odds, all_odds = client.get_odds_for_game(game)
             
             best_odds_by_game[game_key] = {
                 'best_odds': best_odds,
@@ -385,7 +379,7 @@ def export_to_excel(comparisons):
                 # Match the favorite team with a Kalshi market
                 normalized_favorite = normalize_nfl_team_name(favorite_team)
                 for kalshi_market in kalshi_markets:
-                    kalshi_team = kalshi_market.raw_data.get('yes_sub_title', '')
+                    kalshi_team = kalshi_market.yes_sub_title
                     normalized_kalshi_team = normalize_nfl_team_name(kalshi_team)
                     if normalized_kalshi_team == normalized_favorite:
                         best_kalshi_market = kalshi_market
@@ -398,7 +392,7 @@ def export_to_excel(comparisons):
             if best_kalshi_market:
                 # Calculate the specific spread for this Kalshi market
                 kalshi_yes_price = next((o.price for o in best_kalshi_market.outcomes if 'yes' in o.name.lower()), None)
-                kalshi_team_raw = best_kalshi_market.raw_data.get('yes_sub_title', '')
+                kalshi_team_raw = best_kalshi_market.yes_sub_title
                 
                 # Normalize team names and find matching Polymarket price
                 normalized_kalshi_team = normalize_nfl_team_name(kalshi_team_raw)
@@ -461,7 +455,7 @@ def save_to_mongodb(comparisons, use_db=True):
                     # Match the favorite team with a Kalshi market
                     normalized_favorite = normalize_nfl_team_name(favorite_team)
                     for kalshi_market in kalshi_markets:
-                        kalshi_team = kalshi_market.raw_data.get('yes_sub_title', '')
+                        kalshi_team = kalshi_market.yes_sub_title
                         normalized_kalshi_team = normalize_nfl_team_name(kalshi_team)
                         if normalized_kalshi_team == normalized_favorite:
                             best_kalshi_market = kalshi_market
@@ -474,7 +468,7 @@ def save_to_mongodb(comparisons, use_db=True):
                 if best_kalshi_market:
                     # Calculate actual spread for THIS specific Kalshi market
                     kalshi_yes_price = next((o.price for o in best_kalshi_market.outcomes if 'yes' in o.name.lower()), None)
-                    kalshi_team_raw = best_kalshi_market.raw_data.get('yes_sub_title', '')
+                    kalshi_team_raw = best_kalshi_market.yes_sub_title
                     
                     # Normalize team names and find matching Polymarket price
                     normalized_kalshi_team = normalize_nfl_team_name(kalshi_team_raw)
@@ -6,6 +6,8 @@ Maps team names between different formats:
 - City names (Kansas City, Jacksonville)
 - Full names (Kansas City Chiefs)
 """
+import re
+from functools import lru_cache
 
 # NFL team mappings: city -> mascot
 NFL_TEAMS = {
@@ -68,6 +70,37 @@ MASCOT_ALIASES = {
     "football team": "commanders",  # Old name
 }
 
+# City or mascot keyword -> canonical mascot, scanned in a single pass by one
+# precompiled regex (longest keywords first so "new york j" wins over shorter ones)
+_TEAM_KEYWORDS = {**NFL_TEAMS, **{mascot: mascot for mascot in MASCOT_TO_CITY}}
+_TEAM_PATTERN = re.compile(
+    r"\b(?:" + "|".join(re.escape(kw) for kw in sorted(_TEAM_KEYWORDS, key=len, reverse=True)) + r")\b"
+)
+
+def _scan_nfl_team_name(team_lower: str) -> str:
+    """Substring fallback for normalize_nfl_team_name (input already lowercased and cleaned)"""
+    # Check if it's a city name
+    for city, mascot in NFL_TEAMS.items():
+        if city in team_lower or team_lower in city:
+            return mascot
+    
+    # Check if mascot is in the string
+    for mascot in MASCOT_TO_CITY.keys():
+        if mascot in team_lower:
+            return mascot
+    
+    # Return as-is if no match found
+    return team_lower
+
+# Exact lowercase mascot/alias/city -> canonical mascot, so the common inputs skip
+# the substring scan (cities resolved through it once here to keep its precedence)
+NFL_ALIAS_MAP = {
+    **{city: _scan_nfl_team_name(city) for city in NFL_TEAMS},
+    **MASCOT_ALIASES,
+    **{mascot: mascot for mascot in MASCOT_TO_CITY},
+}
+
+@lru_cache(maxsize=1024)
 def normalize_nfl_team_name(team_name: str) -> str:
     """
     Normalize an NFL team name to its canonical mascot form.
@@ -85,78 +118,34 @@ def normalize_nfl_team_name(team_name: str) -> str:
     team_lower = team_lower.replace(" vs ", " ")
     team_lower = team_lower.replace(" vs. ", " ")
     
-    # Check if it's already a mascot name
-    if team_lower in MASCOT_TO_CITY:
-        return team_lower
-    
-    # Check aliases
-    if team_lower in MASCOT_ALIASES:
-        return MASCOT_ALIASES[team_lower]
-    
-    # Check if it's a city name
-    for city, mascot in NFL_TEAMS.items():
-        if city in team_lower or team_lower in city:
-            return mascot
-    
-    # Check if mascot is in the string
-    for mascot in MASCOT_TO_CITY.keys():
-        if mascot in team_lower:
-            return mascot
-    
-    # Return as-is if no match found
-    return team_lower
+    mascot = NFL_ALIAS_MAP.get(team_lower)
+    if mascot is not None:
+        return mascot
+    return _scan_nfl_team_name(team_lower)
 
 def extract_nfl_teams(title: str) -> list:
     """
     Extract NFL team names from a market title.
     
-    Returns normalized mascot names.
+    Returns normalized mascot names, in order of first appearance.
     
     Examples:
         "Chiefs vs. Jaguars" -> ["chiefs", "jaguars"]
         "Kansas City at Jacksonville Winner?" -> ["chiefs", "jaguars"]
         "Spread: Jaguars (-3.5)" -> ["jaguars"]
     """
+    return list(_extract_nfl_teams(title))
+
+@lru_cache(maxsize=8192)
+def _extract_nfl_teams(title: str) -> tuple:
+    """Cached implementation of extract_nfl_teams (tuple so cached results can't be mutated)"""
     teams = []
-    title_lower = title.lower()
-    
-    # Try to split by common separators
-    if " vs. " in title_lower:
-        parts = title_lower.split(" vs. ")
-    elif " vs " in title_lower:
-        parts = title_lower.split(" vs ")
-    elif " at " in title_lower:
-        parts = title_lower.split(" at ")
-    elif " @ " in title_lower:
-        parts = title_lower.split(" @ ")
-    else:
-        parts = [title_lower]
-    
-    # Extract team from each part
-    for part in parts:
-        # Clean up common phrases
-        part = part.replace("winner?", "")
-        part = part.replace("winner", "")
-        part = part.replace("spread:", "")
-        part = part.replace("o/u", "")
-        part = part.replace("over/under", "")
-        part = part.strip()
-        
-        # Check for city names
-        for city, mascot in NFL_TEAMS.items():
-            if city in part:
-                if mascot not in teams:
-                    teams.append(mascot)
-                break
-        else:
-            # Check for mascot names
-            for mascot in MASCOT_TO_CITY.keys():
-                if mascot in part:
-                    if mascot not in teams:
-                        teams.append(mascot)
-                    break
-    
-    return teams
+    for match in _TEAM_PATTERN.finditer(title.lower()):
+        mascot = _TEAM_KEYWORDS[match.group(0)]
+        if mascot not in teams:
+            teams.append(mascot)
+    
+    return tuple(teams)
 
 def are_same_nfl_teams(teams1: list, teams2: list) -> bool:
     """
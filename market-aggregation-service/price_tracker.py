@@ -3,6 +3,7 @@ Price Tracker - Continuously tracks price changes every 5 seconds
 """
 import time
 import asyncio
+import heapq
 from datetime import datetime
 from typing import List, Dict, Optional
 import sys
@@ -64,10 +65,9 @@ class PriceTracker:
         print(f"{'=' * 70}")
         
         # Fetch all markets
-        markets = self.aggregator.fetch_all_markets(
+        markets = await self.aggregator.fetch_all_markets_async(
             include_polymarket=True,
             include_kalshi=True,
-            include_limitless=True,
             limit_per_platform=100
         )
         
@@ -163,7 +163,7 @@ class PriceTracker:
         
         # Show best odds differentials
         print(f"\n🎯 TOP 3 PRICE DIFFERENTIALS:")
-        best_odds = sorted(comparisons, key=lambda c: c.price_spread, reverse=True)[:3]
+        best_odds = heapq.nlargest(3, comparisons, key=lambda c: c.price_spread)
         for i, comp in enumerate(best_odds, 1):
             print(f"\n  {i}. {comp.question[:60]}...")
             print(f"     Best: {comp.best_platform.value} @ {comp.best_odds} ({comp.best_price:.1%})")
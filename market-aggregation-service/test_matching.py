@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Market Matching Checks
+Offline checks that MarketAggregator.match_markets groups NFL games across
+platforms (run directly or with pytest)
+"""
+
+from models import UnifiedMarket, Platform, MarketType
+from aggregator import MarketAggregator
+
+GAMES = [
+    ("Chiefs", "Jaguars", "Kansas City", "Jacksonville"),
+    ("Bills", "Patriots", "Buffalo", "New England"),
+    ("Eagles", "Cowboys", "Philadelphia", "Dallas"),
+    ("Packers", "Bears", "Green Bay", "Chicago"),
+]
+
+
+def nfl_bucket(games):
+    """One Polymarket game market and two Kalshi per-team winner markets per game"""
+    markets = []
+    for idx, (team_a, team_b, city_a, city_b) in enumerate(games):
+        markets.append(UnifiedMarket(Platform.POLYMARKET, f"poly-{idx}", f"{team_a} vs. {team_b}", [], MarketType.SPORTS))
+        for side in ("a", "b"):
+            markets.append(UnifiedMarket(
+                Platform.KALSHI, f"kalshi-{idx}{side}", f"{city_a} at {city_b} Winner?", [], MarketType.SPORTS
+            ))
+    return markets
+
+
+def match_ids(markets):
+    aggregator = MarketAggregator()
+    aggregator.all_markets = markets
+    return [[m.market_id for m in group] for group in aggregator.match_markets()]
+
+
+def test_single_game_slate_matches():
+    """A one-game slate (e.g. Thursday night) still groups its three markets"""
+    assert match_ids(nfl_bucket(GAMES[:1])) == [["poly-0", "kalshi-0a", "kalshi-0b"]]
+
+
+def test_every_slate_size_matches():
+    for size in range(1, len(GAMES) + 1):
+        expected = [[f"poly-{idx}", f"kalshi-{idx}a", f"kalshi-{idx}b"] for idx in range(size)]
+        assert match_ids(nfl_bucket(GAMES[:size])) == expected, f"{size}-game slate"
+
+
+def main():
+    """Run all checks"""
+    test_single_game_slate_matches()
+    test_every_slate_size_matches()
+    print("\n✅ All matching checks passed")
+
+
+if __name__ == "__main__":
+    main()
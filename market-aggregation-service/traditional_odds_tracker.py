@@ -5,6 +5,7 @@ Continuously tracks NFL odds from traditional sportsbooks via The Odds API
 import time
 import argparse
 from datetime import datetime
+from typing import Optional
 from api_clients.odds_api_client import OddsAPIClient
 from odds_api_exporter import OddsAPIExporter
 
@@ -12,12 +13,12 @@ from odds_api_exporter import OddsAPIExporter
 class TraditionalOddsTracker:
     """Continuous tracker for traditional sportsbook odds"""
     
-    def __init__(self, api_key: str, interval: int = 5):
+    def __init__(self, api_key: Optional[str] = None, interval: int = 5):
         """
         Initialize tracker
         
         Args:
-            api_key: The Odds API key
+            api_key: The Odds API key (default: ODDS_API_KEY environment variable)
             interval: Update interval in seconds (default: 5)
         """
         self.api_key = api_key
@@ -28,18 +29,10 @@ class TraditionalOddsTracker:
     def fetch_and_export(self):
         """Fetch odds and export to CSV"""
         try:
-            # Fetch NFL odds
-            games = self.client.fetch_nfl_odds()
-            
-            if not games:
-                print("⚠️  No games found")
-                return 0
-            
-            # Process each game
+            # Stream NFL odds and process each game as it arrives
             game_count = 0
-            for game in games:
-                best_odds = self.client.get_best_odds_for_game(game)
-                all_odds = self.client.get_all_odds_for_game(game)
+            for game in self.client.iter_nfl_odds():
+                best_odds, all_odds = self.client.get_odds_for_game(game)
                 
                 # Add to exporter
                 self.exporter.add_game(
@@ -49,6 +42,10 @@ class TraditionalOddsTracker:
                 )
                 game_count += 1
             
+            if not game_count:
+                print("⚠️  No games found")
+                return 0
+            
             # Export to CSV files
             self.exporter.export()
             
@@ -133,8 +130,8 @@ def main():
     parser.add_argument(
         "--api-key",
         type=str,
-        default="db06be1d18367c369444aa40d6a25499",
-        help="The Odds API key"
+        default=None,
+        help="The Odds API key (default: ODDS_API_KEY environment variable)"
     )
     
     args = parser.parse_args()